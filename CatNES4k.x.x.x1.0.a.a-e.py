@@ -1,8 +1,15 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import struct # Not strictly used in this version after changes, but good for iNES parsing
+import struct # Unpacks the iNES header in one go!
 import time
 import threading
+import types # For binding our runtime-generated opcode handlers!
+import bisect # Keeps the PPU event schedule sorted, tidy tidy!
+import cProfile # For finding out where the time really goes!
+import pstats
+import os
+import sys
+from array import array # Compact typed tables for our speedy address decoder!
 
 # --- Constants for "EMUNES" Dark Theme ---
 DARK_BG = "#2B2B2B"
@@ -12,12 +19,28 @@ DARK_FG = "#E0E0E0" # Text color for dark theme
 NES_WIDTH = 256
 NES_HEIGHT = 240
 
+# Binary PPM (P6) header for whole-frame uploads to Tk, one call per frame!
+PPM_HEADER = b"P6\n%d %d\n255\n" % (NES_WIDTH, NES_HEIGHT)
+
 # iNES Header Constants
 INES_HEADER_SIZE = 16
 PRG_PAGE = 16 * 1024
 CHR_PAGE = 8 * 1024
 TRAINER_SIZE = 512
 
+# Profiling: run N frames under cProfile, then dump stats here
+PROFILE_STATS_FILE = "emunes.prof"
+PROFILE_DEFAULT_FRAMES = 600
+RUN_FLAG_POLL_INTERVAL = 1024 # CPU steps between peeks at the pause flag in the emulation loop
+
+# Frame pacing: sleep for the bulk of the wait, then spin the last bit so coarse OS timers can't make us late!
+SLEEP_SPIN_MARGIN = 0.001 # Seconds left for the busy-wait at the end of each frame
+
+# NTSC PPU timing
+DOTS_PER_SCANLINE = 341
+SCANLINES_PER_FRAME = 262
+DOTS_PER_FRAME = DOTS_PER_SCANLINE * SCANLINES_PER_FRAME
+
 # CPU Status Flags
 C_FLAG = 1 << 0  # Carry
 Z_FLAG = 1 << 1  # Zero
@@ -28,6 +51,36 @@ U_FLAG = 1 << 5  # Unused (always 1 on NES 6502)
 V_FLAG = 1 << 6  # Overflow
 N_FLAG = 1 << 7  # Negative
 
+# CPU register slots in CPU6502.state, one packed array for all of them!
+PC, SP, A, X, Y, ST, CYC = range(7)
+
+# Bus read regions, looked up from a precomputed per-address table!
+REGION_OPEN = 0 # Unmapped, open bus
+REGION_RAM  = 1 # $0000-$1FFF CPU RAM (mirrored)
+REGION_PPU  = 2 # $2000-$3FFF PPU registers (mirrored)
+REGION_CTRL = 3 # $4016 Controller 1
+REGION_PRG  = 4 # $8000-$FFFF PRG ROM
+
+# Demo mapping from a tile's 2-bit pixel value to a color in nes_palette_rgb!
+DISPLAY_COLOR_LUT = (0, 13, 30, 45)
+DISPLAY_COLOR_TABLE = bytes(DISPLAY_COLOR_LUT) + bytes(256 - len(DISPLAY_COLOR_LUT)) # Same thing, for bytes.translate!
+BLANK_ROW = bytes(NES_WIDTH) # A whole scanline of palette index 0, reused forever!
+
+def _spread_bits(byte: int) -> int:
+    # Puts each bit of a bitplane byte at the bottom of its own output byte, leftmost pixel (bit 7) first!
+    spread = 0
+    for x in range(8):
+        if byte & (0x80 >> x):
+            spread |= 1 << (8 * (7 - x))
+    return spread
+
+# SWAR bit-plane expansion table: (SPREAD[plane0] | SPREAD[plane1] << 1) is a whole 8-pixel row at once!
+CHR_BIT_SPREAD = tuple(_spread_bits(b) for b in range(256))
+
+def palette_channel_tables(palette_rgb) -> tuple:
+    # (r, g, b) tuples in, three 256-byte R/G/B tables out. Unused indices are black, meow!
+    return tuple(bytes(color[channel] for color in palette_rgb).ljust(256, b"\x00") for channel in range(3))
+
 # -----------------------------------
 #       iNES Header Parser
 # -----------------------------------
@@ -35,11 +88,12 @@ class INESHeader:
     def __init__(self, data: bytes):
         if len(data) < INES_HEADER_SIZE:
             raise ValueError("File is too short for an iNES header, mew! Needs more data!")
-        if data[0:4] != b"NES\x1a":
+        if memoryview(data)[:4] != b"NES\x1a": # Compare the signature without copying it out!
             raise ValueError("Not a valid iNES file, purr! Signature is wrong! :(")
-        self.prg_pages = data[4]
-        self.chr_pages = data[5]
-        flags6 = data[6]; flags7 = data[7]
+        # Bytes 4-10 all at once: page counts, then flags 6-10 (NES 2.0 uses more flags here!)
+        prg_pages, chr_pages, flags6, flags7, flags8, flags9, flags10 = struct.unpack_from("<7B", data, 4)
+        self.prg_pages = prg_pages
+        self.chr_pages = chr_pages
         self.mirroring   = bool(flags6 & 1) # 0 for horizontal, 1 for vertical
         self.battery     = bool(flags6 & 2) # Has battery-backed PRG RAM ($6000-7FFF)
         self.trainer     = bool(flags6 & 4) # Has a 512-byte trainer at $7000-$71FF
@@ -47,9 +101,8 @@ class INESHeader:
         mapper_lo = flags6 >> 4; mapper_hi = flags7 & 0xF0
         self.mapper      = mapper_hi | mapper_lo
         self.is_nes2     = ((flags7 & 0x0C) == 0x08) # Check if it's NES 2.0 format
-        flags9 = data[9]; flags10 = data[10] # NES 2.0 uses more flags here!
-        self.prg_size    = self.prg_pages * PRG_PAGE
-        self.chr_size    = self.chr_pages * CHR_PAGE if self.chr_pages > 0 else CHR_PAGE # CHR-RAM if 0
+        self.prg_size    = prg_pages * PRG_PAGE
+        self.chr_size    = chr_pages * CHR_PAGE if chr_pages > 0 else CHR_PAGE # CHR-RAM if 0
         self.tv_system   = 1 if (flags9 & 1 or (not self.is_nes2 and flags10 & 1)) else 0 # 0: NTSC, 1: PAL
 
     def __str__(self):
@@ -63,12 +116,58 @@ class INESHeader:
                 f" NES 2.0 format: {self.is_nes2} (The newer, fancier format!)\n"
                 f" TV system: {'PAL' if self.tv_system else 'NTSC'} (Different TV speeds, interesting!)")
 
+# -----------------------------------
+#   Specialized opcode codegen - straight-line handlers, zoom!
+# -----------------------------------
+# Each template gets fetch and bus.read inlined, then is exec'd once into a real function.
+# These templates ARE the opcodes - there's no op_* method for them, so there's only one copy to keep right!
+# This skips the fetch()/addr_abs()/update_zn_flags() method calls on the hottest opcodes!
+_FETCH_IMM = "v = read(pc); pc = (pc + 1) & 0xFFFF"
+_FETCH_ABS = "lo = read(pc); hi = read((pc + 1) & 0xFFFF); pc = (pc + 2) & 0xFFFF; addr = (hi << 8) | lo"
+_SET_ZN = "s[ST] = (s[ST] & ~(Z_FLAG | N_FLAG)) | (Z_FLAG if v == 0 else 0) | (v & N_FLAG)"
+
+_SPECIALIZED_OPCODE_TEMPLATES = {
+    0xA9: ("op_lda_imm", [_FETCH_IMM, "s[PC] = pc", "s[A] = v", _SET_ZN, "s[CYC] += 2"]),
+    0xAD: ("op_lda_abs", [_FETCH_ABS, "s[PC] = pc", "v = read(addr)", "s[A] = v", _SET_ZN, "s[CYC] += 4"]),
+    0x8D: ("op_sta_abs", [_FETCH_ABS, "s[PC] = pc", "self.bus.write(addr, s[A])", "s[CYC] += 4"]),
+    0xA2: ("op_ldx_imm", [_FETCH_IMM, "s[PC] = pc", "s[X] = v", _SET_ZN, "s[CYC] += 2"]),
+    0x4C: ("op_jmp_abs", [_FETCH_ABS, "s[PC] = addr", "s[CYC] += 3"]),
+}
+
+def _build_specialized_opcodes() -> dict: # Turns the templates into functions, like magic!
+    namespace = {"Z_FLAG": Z_FLAG, "N_FLAG": N_FLAG, "PC": PC, "A": A, "X": X, "ST": ST, "CYC": CYC}
+    handlers = {}
+    for opcode, (name, lines) in _SPECIALIZED_OPCODE_TEMPLATES.items():
+        prologue = ["s = self.state", "read = self.bus.read", "pc = s[PC]"]
+        body = "\n".join("    " + line for line in prologue + lines)
+        exec(f"def {name}(self):\n{body}\n", namespace)
+        handlers[opcode] = namespace[name]
+    return handlers
+
+SPECIALIZED_OPCODES = _build_specialized_opcodes() # Built once when the module loads!
+
+def _state_register(index: int, doc: str) -> property: # Attribute-style shim over one state slot!
+    def getter(self): return self.state[index]
+    def setter(self, value): self.state[index] = value
+    return property(getter, setter, doc=doc)
+
 # -----------------------------------
 #       CPU 6502 with more opcodes!
 # -----------------------------------
 class CPU6502:
+    # Registers live in self.state (indexed by PC, SP, A, X, Y, ST, CYC) so the hot opcodes
+    # do quick C-level indexed loads. These shims keep self.pc & friends working for the GUI/debug path!
+    pc = _state_register(PC, "Program Counter")
+    sp = _state_register(SP, "Stack Pointer")
+    a = _state_register(A, "Accumulator")
+    x = _state_register(X, "X Register")
+    y = _state_register(Y, "Y Register")
+    status = _state_register(ST, "Status Register")
+    cycles = _state_register(CYC, "Cycle counter")
+
     def __init__(self, bus):
         self.bus = bus
+        self.state = array('q', [0] * 8) # pc, sp, a, x, y, status, cycles (+1 spare) all packed together!
         self.pc = 0x0000 # Program Counter, ready for action!
         self.sp = 0xFD   # Stack Pointer, starts high and goes down!
         self.a = 0x00    # Accumulator, our main helper register!
@@ -79,16 +178,14 @@ class CPU6502:
 
         self.opcodes = {
             0xEA: self.op_nop,     # No Operation, a little break for the CPU!
-            0xA9: self.op_lda_imm, # Load A Immediate
-            0xAD: self.op_lda_abs, # Load A Absolute
-            0x8D: self.op_sta_abs, # Store A Absolute
-            0xA2: self.op_ldx_imm, # Load X Immediate
             0x9A: self.op_txs,     # Transfer X to Stack Pointer
             0x78: self.op_sei,     # Set Interrupt Disable
-            0x4C: self.op_jmp_abs, # Jump Absolute
             # TODO: Add many more opcodes to make games run! Like branches, other addressing modes, etc. It's a big adventure!
             # Example: 0x20 JSR, 0x60 RTS, 0xD0 BNE, 0xF0 BEQ, 0x24 BIT zp
         }
+        # LDA imm/abs, STA abs, LDX imm and JMP abs come straight from the specialized templates, zoom!
+        for opcode, handler in SPECIALIZED_OPCODES.items():
+            self.opcodes[opcode] = types.MethodType(handler, self)
 
     def set_flag(self, flag_mask, value: bool):
         if value: self.status |= flag_mask
@@ -110,8 +207,10 @@ class CPU6502:
         print(f"CPU Reset! PC jumped to ${self.pc:04X}, ready to go, nya~!")
 
     def fetch(self) -> int: # Fetches one byte and increments PC!
-        val = self.bus.read(self.pc)
-        self.pc = (self.pc + 1) & 0xFFFF # PC wraps around at 64K!
+        s = self.state
+        pc = s[PC]
+        val = self.bus.read(pc)
+        s[PC] = (pc + 1) & 0xFFFF # PC wraps around at 64K!
         return val
 
     # --- Stack Operations ---
@@ -146,18 +245,25 @@ class CPU6502:
 
     def step(self) -> int: # Executes one instruction!
         # self.cycles = 0 # Reset cycle count for this instruction
-        opcode = self.fetch()
-        handler = self.opcodes.get(opcode)
+        s = self.state
+        before = s[CYC] # Remember the running total so we can hand back just this instruction's cycles!
+        pc = s[PC]
+        handler = self.bus.decode_cache[pc] # Already decoded this address? Skip the read and lookup!
+        if handler is None:
+            opcode = self.bus.read(pc)
+            handler = self.opcodes.get(opcode)
+            if handler:
+                self.bus.cache_decoded(pc, handler)
+        s[PC] = (pc + 1) & 0xFFFF # PC wraps around at 64K!
         # print(f"PC:${(self.pc-1):04X} Opcode:${opcode:02X} A:${self.a:02X} X:${self.x:02X} Y:${self.y:02X} SP:${self.sp:02X} P:${self.status:02X} CYC:{self.cycles}")
 
         if handler:
-            prev_cycles = self.cycles # Store cycles before instruction for accurate counting
             handler()
             # return self.cycles # Instruction handler updates self.cycles with its duration
         else:
-            print(f"CPU: Unimplemented opcode ${opcode:02X} at PC ${self.pc-1:04X}! Oh noes! Using NOP for now...")
+            print(f"CPU: Unimplemented opcode ${opcode:02X} at PC ${pc:04X}! Oh noes! Using NOP for now...")
             self.op_nop() # Default to NOP for unknown opcodes
-        return self.cycles # Cycles for this step
+        return s[CYC] - before # Cycles for this step only, not the running total, meow!
 
     # --- Addressing Modes (as helper methods) ---
     def addr_abs(self) -> int: # Absolute addressing mode
@@ -166,43 +272,18 @@ class CPU6502:
         return (hi << 8) | lo
 
     # --- Opcodes Implementations ---
-    def op_nop(self): self.cycles += 2
+    def op_nop(self): self.state[CYC] += 2
     
-    def op_lda_imm(self): # Load Accumulator with Immediate value
-        value = self.fetch()
-        self.a = value
-        self.update_zn_flags(self.a)
-        self.cycles += 2
-
-    def op_lda_abs(self): # Load Accumulator from Absolute address
-        addr = self.addr_abs()
-        self.a = self.bus.read(addr)
-        self.update_zn_flags(self.a)
-        self.cycles += 4
-
-    def op_sta_abs(self): # Store Accumulator to Absolute address
-        addr = self.addr_abs()
-        self.bus.write(addr, self.a)
-        self.cycles += 4
-        
-    def op_ldx_imm(self): # Load X Register with Immediate value
-        value = self.fetch()
-        self.x = value
-        self.update_zn_flags(self.x)
-        self.cycles += 2
-
     def op_txs(self): # Transfer X to Stack Pointer
-        self.sp = self.x
+        s = self.state
+        s[SP] = s[X]
         # TXS does not affect flags, yay!
-        self.cycles += 2
+        s[CYC] += 2
 
     def op_sei(self): # Set Interrupt Disable flag
-        self.set_flag(I_FLAG, True)
-        self.cycles += 2
-
-    def op_jmp_abs(self): # Jump to Absolute address
-        self.pc = self.addr_abs() # PC is set directly!
-        self.cycles += 3
+        s = self.state
+        s[ST] |= I_FLAG
+        s[CYC] += 2
 
 # -----------------------------------
 #       PPU2C02 with CHR decoding and palette!
@@ -210,7 +291,8 @@ class CPU6502:
 class PPU2C02:
     def __init__(self, chr_data: bytes):
         self.chr_rom_data = chr_data # This is CHR ROM data, so exciting!
-        self.screen_buffer = [[0]*NES_WIDTH for _ in range(NES_HEIGHT)] # Stores palette indices!
+        # Stores palette indices! One preallocated bytearray per scanline, so render() never allocates.
+        self.screen_buffer = [bytearray(NES_WIDTH) for _ in range(NES_HEIGHT)]
         
         # A simple, happy NES grayscale palette! Real NES has 64 colors!
         self.nes_palette_rgb = [ 
@@ -234,11 +316,13 @@ class PPU2C02:
             (204,210,120), (180,222,120), (168,226,144), (152,226,180),
             (160,214,228), (160,162,160), (0,0,0), (0,0,0),
         ]
+        # Same colors split into R, G and B channels: 256-byte tables, ready for bytes.translate over a whole frame!
+        self.palette_channels = palette_channel_tables(self.nes_palette_rgb)
 
         self.pattern_table = [] # Stores decoded tiles, like little pictures!
+        self.tile_row_bytes = [] # Display color indices per tile row (tile_idx*8 + y), ready to blit!
         if self.chr_rom_data:
             num_tiles_in_chr = len(self.chr_rom_data) // 16
-            self.pattern_table = [[([0]*8) for _ in range(8)] for _ in range(num_tiles_in_chr)]
             self._decode_chr_data()
             print(f"PPU: Decoded {num_tiles_in_chr} CHR tiles, yay!")
         else:
@@ -258,25 +342,27 @@ class PPU2C02:
         self.is_first_write_latch = True # Helps $2005/$2006 know if it's the first or second byte!
 
         # PPU Timing and NMI - keeping everything in sync!
-        self.scanline = 0
-        self.cycle = 0
+        # Time is one master dot counter; scanline/cycle are worked out from it on demand.
+        self.master_cycles = 0
         self.vblank_active = False
         self.nmi_occurred = False
         self.nmi_enabled_in_ctrl = False
+        self._schedule_frame_events()
 
 
     def _decode_chr_data(self): # Decodes CHR into usable patterns, magic!
-        num_tiles = len(self.pattern_table)
-        for tile_idx in range(num_tiles):
-            tile_bytes = self.chr_rom_data[tile_idx*16 : (tile_idx+1)*16]
-            for y in range(8): # Each tile is 8 pixels high
-                plane0 = tile_bytes[y]     # First bitplane
-                plane1 = tile_bytes[y+8]   # Second bitplane
-                for x in range(8): # Each tile is 8 pixels wide
-                    bit0 = (plane0 >> (7-x)) & 1
-                    bit1 = (plane1 >> (7-x)) & 1
-                    palette_entry = (bit1 << 1) | bit0 # Gives 0, 1, 2, or 3 for this pixel!
-                    self.pattern_table[tile_idx][y][x] = palette_entry
+        # Each row comes out of the spread table as one int holding 8 two-bit pixels,
+        # so there's no per-pixel shifting at all! Rows are bytes, so pattern_table[t][y][x] still works.
+        chr_data = self.chr_rom_data
+        spread = CHR_BIT_SPREAD
+        num_tiles = len(chr_data) // 16
+        pattern_table = []
+        for base in range(0, num_tiles * 16, 16):
+            # Bytes 0-7 are the first bitplane, bytes 8-15 the second bitplane
+            pattern_table.append([(spread[chr_data[base + y]] | (spread[chr_data[base + y + 8]] << 1)).to_bytes(8, "big")
+                                  for y in range(8)]) # Gives 0, 1, 2, or 3 for each pixel!
+        self.pattern_table = pattern_table
+        self.tile_row_bytes = [row.translate(DISPLAY_COLOR_TABLE) for tile in pattern_table for row in tile]
     
     def reset(self):
         self.ppuctrl = 0x00
@@ -284,13 +370,54 @@ class PPU2C02:
         self.ppuscroll = 0x00 # Clear scroll registers
         self.ppuaddr = 0x00   # Clear VRAM address register
         self.is_first_write_latch = True
-        self.scanline = 0
-        self.cycle = 0
+        self.master_cycles = 0
         self.vblank_active = False
         self.nmi_occurred = False
         self.nmi_enabled_in_ctrl = False
+        self._schedule_frame_events()
         print("PPU Reset! All shiny and new, purr!")
 
+    @property
+    def scanline(self) -> int: # Which scanline the beam is on, 0-261!
+        return (self.master_cycles % DOTS_PER_FRAME) // DOTS_PER_SCANLINE
+
+    @property
+    def cycle(self) -> int: # Which dot of the scanline, 0-340!
+        return self.master_cycles % DOTS_PER_SCANLINE
+
+    # --- Event scheduler: the PPU only does work when something actually happens! ---
+    def _schedule_frame_events(self):
+        # Sorted master-cycle timestamps with a parallel list of callbacks
+        self._event_cycles = array('q')
+        self._event_callbacks = []
+        frame_start = self.master_cycles - (self.master_cycles % DOTS_PER_FRAME)
+        self._schedule(frame_start + 241 * DOTS_PER_SCANLINE + 1, self._on_vblank_start) # (241, 1)
+        self._schedule(frame_start + 261 * DOTS_PER_SCANLINE + 1, self._on_prerender)    # (261, 1)
+        self._schedule(frame_start + DOTS_PER_FRAME, self._on_frame_end)                  # back to (0, 0)
+
+    def _schedule(self, at_cycle: int, callback):
+        i = bisect.bisect_right(self._event_cycles, at_cycle)
+        self._event_cycles.insert(i, at_cycle)
+        self._event_callbacks.insert(i, callback)
+
+    def _on_vblank_start(self, at_cycle: int): # VBlank starts precisely here!
+        if not self.vblank_active: # Set VBlank flag
+            self.vblank_active = True
+            if self.nmi_enabled_in_ctrl: # If NMI is enabled in PPUCTRL ($2000)
+                self.nmi_occurred = True # Signal NMI to CPU!
+                # print("PPU: NMI signal generated for VBlank!")
+        self._schedule(at_cycle + DOTS_PER_FRAME, self._on_vblank_start)
+
+    def _on_prerender(self, at_cycle: int): # Pre-render scanline
+        self.vblank_active = False # VBlank ends
+        # TODO: Clear sprite overflow and sprite 0 hit flags here!
+        self._schedule(at_cycle + DOTS_PER_FRAME, self._on_prerender)
+
+    def _on_frame_end(self, at_cycle: int): # Scanline 262 wraps back to the top!
+        self.nmi_occurred = False # Reset NMI flag for next frame! Frame is done!
+        # This is where rendering for the *next* frame would conceptually start
+        self._schedule(at_cycle + DOTS_PER_FRAME, self._on_frame_end)
+
     def read_register(self, addr: int) -> int: # CPU reads from PPU registers!
         val = 0
         if addr == 0x0002: # PPUSTATUS ($2002)
@@ -350,81 +477,46 @@ class PPU2C02:
             pass
 
     def tick(self, cpu_cycles_elapsed: int): # PPU runs 3 times faster than CPU! Tick tock!
-        ppu_ticks_to_run = cpu_cycles_elapsed * 3
-        for _ in range(ppu_ticks_to_run):
-            self.cycle += 1
-            if self.cycle >= 341: # Cycles per scanline
-                self.cycle = 0
-                self.scanline += 1
-                if self.scanline >= 262: # Scanlines per frame (NTSC)
-                    self.scanline = 0 # Back to the top!
-                    self.nmi_occurred = False # Reset NMI flag for next frame! Frame is done!
-                    # This is where rendering for the *next* frame would conceptually start
-                
-                # VBlank period: scanlines 241-260
-                if self.scanline == 241 and self.cycle == 1: # VBlank starts precisely here!
-                    if not self.vblank_active: # Set VBlank flag
-                        self.vblank_active = True
-                        if self.nmi_enabled_in_ctrl: # If NMI is enabled in PPUCTRL ($2000)
-                            self.nmi_occurred = True # Signal NMI to CPU!
-                            # print("PPU: NMI signal generated for VBlank!")
-                elif self.scanline == 261 and self.cycle == 1: # Pre-render scanline
-                    self.vblank_active = False # VBlank ends
-                    # TODO: Clear sprite overflow and sprite 0 hit flags here!
-
-            # TODO: Add rendering logic per scanline for cycle accuracy! It's a big adventure!
-            # For now, render() is called once per frame in the main loop.
+        # One add instead of a loop per dot; then fire whatever events we just passed, in order.
+        self.master_cycles += cpu_cycles_elapsed * 3
+        event_cycles = self._event_cycles
+        while event_cycles and event_cycles[0] <= self.master_cycles:
+            at_cycle = event_cycles.pop(0)
+            self._event_callbacks.pop(0)(at_cycle)
+
+        # TODO: Add rendering logic per scanline for cycle accuracy! It's a big adventure!
+        # For now, render() is called once per frame in the main loop.
 
     def render(self) -> list: # Creates the pixel data for the screen! So colorful!
         # This is a VERY simplified render. It should use nametables, attributes etc. from PPU VRAM!
         # For now, let's just draw tiles 0-N in sequence to show decoded CHR.
-        tile_idx_counter = 0
-        
+        # Everything is written into the preallocated screen_buffer rows with slice copies,
+        # so there's no garbage made per frame, purr!
+        screen_buffer = self.screen_buffer
+
         if not self.pattern_table: # If no CHR tiles (e.g. CHR-RAM not yet filled or no CHR-ROM)
             # Fill screen_buffer with a default background color index (e.g. index 0 from palette)
-            for y in range(NES_HEIGHT):
-                for x in range(NES_WIDTH):
-                    self.screen_buffer[y][x] = 0 # Default background color
-            return self.screen_buffer
-
+            for row in screen_buffer:
+                row[:] = BLANK_ROW
+            return screen_buffer
+
+        # A real PPU uses each tile pixel's 0-3 index to select a *color within a sub-palette*,
+        # and the sub-palette is chosen by the attribute table. For this demo the 0-3 index is
+        # mapped through DISPLAY_COLOR_LUT, which tile_row_bytes already has baked in!
+        tile_row_bytes = self.tile_row_bytes
         num_decoded_tiles = len(self.pattern_table)
+        tiles_per_row = NES_WIDTH // 8 # 32 tile columns
 
         for tile_row in range(NES_HEIGHT // 8): # 30 tile rows
-            for tile_col in range(NES_WIDTH // 8): # 32 tile columns
-                if num_decoded_tiles == 0: # Safety, should be caught above
-                    current_tile_idx = 0 # Default to tile 0 if something is wrong
-                else:
-                    # Cycle through available tiles to fill the screen
-                    current_tile_idx = tile_idx_counter % num_decoded_tiles
-                
-                chosen_tile_pattern = self.pattern_table[current_tile_idx]
-
-                for y_in_tile in range(8):
-                    for x_in_tile in range(8):
-                        pixel_palette_idx = chosen_tile_pattern[y_in_tile][x_in_tile]
-                        # This pixel_palette_idx (0-3) needs to be combined with attribute table data
-                        # to select one of the 4 background palettes, then that palette's color.
-                        # For now, we'll just use it directly as an index into our main palette.
-                        # A real PPU uses this index to select a *color within a sub-palette*,
-                        # and the sub-palette is chosen by the attribute table.
-                        # Let's use a fixed sub-palette for now (e.g., colors 0,1,2,3 from main palette)
-                        # Or, for more visual variety with this simple render:
-                        # palette_base_offset = (current_tile_idx % 4) * 4 # Cycle through 4 basic palettes
-                        # final_color_idx = palette_base_offset + pixel_palette_idx
-
-                        # For this demo, let's just use the raw 0-3 index to pick from the first 4 colors
-                        # or map to a specific set of colors.
-                        # A simple mapping: 0 -> color 0, 1 -> color 13, 2 -> color 30, 3 -> color 45 from nes_palette_rgb
-                        display_color_idx = [0, 13, 30, 45][pixel_palette_idx % 4]
-
-
-                        screen_x = tile_col * 8 + x_in_tile
-                        screen_y = tile_row * 8 + y_in_tile
-                        if screen_y < NES_HEIGHT and screen_x < NES_WIDTH:
-                             self.screen_buffer[screen_y][screen_x] = display_color_idx
-                
-                tile_idx_counter += 1
-        return self.screen_buffer # Returns list of lists of palette indices!
+            # Cycle through available tiles to fill the screen
+            first_tile_idx = tile_row * tiles_per_row
+            for y_in_tile in range(8):
+                row = screen_buffer[tile_row * 8 + y_in_tile]
+                for tile_col in range(tiles_per_row):
+                    current_tile_idx = (first_tile_idx + tile_col) % num_decoded_tiles
+                    screen_x = tile_col * 8
+                    row[screen_x:screen_x + 8] = tile_row_bytes[current_tile_idx * 8 + y_in_tile]
+        return screen_buffer # Returns list of rows of palette indices!
 
 
 # -----------------------------------
@@ -441,37 +533,68 @@ class Bus:
         self.controller_strobe_mode = False
         self.controller_shift_register = 0 # Stores current button states for reading
 
+        self._build_read_tables()
+
+        # Decoded opcode handler per address, filled in by the CPU as it runs!
+        # PRG ROM never changes on mapper 0, so those entries never need invalidating.
+        self.decode_cache = [None] * 0x10000
+        self.code_in_ram = False # Only becomes True once the CPU actually runs code from RAM!
+
+    def _build_read_tables(self): # Decode every address once, so reads never do range math again!
+        # read_tag[addr] says which region an address lives in, read_offset[addr] is the
+        # already-mirrored offset inside that region (no more modulo per access, purr!)
+        self.read_tag = bytearray(0x10000) # Everything starts as open bus
+        self.read_offset = array('H', bytes(2 * 0x10000))
+        self.read_tag[0x0000:0x2000] = bytes([REGION_RAM]) * 0x2000
+        self.read_offset[0x0000:0x2000] = array('H', [a & 0x07FF for a in range(0x2000)])
+        self.read_tag[0x2000:0x4000] = bytes([REGION_PPU]) * 0x2000
+        self.read_offset[0x2000:0x4000] = array('H', [a & 0x0007 for a in range(0x2000)])
+        self.read_tag[0x4016] = REGION_CTRL
+        prg_len = len(self.prg_rom)
+        if prg_len: # Mapper 0 (NROM) mirrors 16KB PRG into both halves. Other mappers are more complex!
+            self.read_tag[0x8000:0x10000] = bytes([REGION_PRG]) * 0x8000
+            self.read_offset[0x8000:0x10000] = array('H', [a % prg_len for a in range(0x8000)])
+
+    def cache_decoded(self, addr: int, handler): # Remember a decoded opcode, if it's safe to!
+        tag = self.read_tag[addr]
+        if tag == REGION_PRG: # Read-only on NROM, cache forever!
+            self.decode_cache[addr] = handler
+        elif tag == REGION_RAM: # Code in RAM can be rewritten, so writes must start invalidating
+            self.code_in_ram = True
+            self.decode_cache[addr] = handler
+
     def connect_ppu(self, ppu_instance: PPU2C02): # Just in case it's created outside
         self.ppu = ppu_instance
 
     def read(self, addr: int) -> int:
         addr &= 0xFFFF # Ensure 16-bit address
-        val = 0x00 # Default read value
-        if addr <= 0x1FFF: # CPU RAM ($0000-$07FF mirrored up to $1FFF)
-            val = self.cpu_ram[addr & 0x07FF]
-        elif 0x2000 <= addr <= 0x3FFF: # PPU Registers (mirrored $2000-$2007 up to $3FFF)
-            val = self.ppu.read_register(addr & 0x0007)
-        elif addr == 0x4016: # Controller 1 Read
+        tag = self.read_tag[addr]
+        if tag == REGION_PRG: # PRG ROM first, it's where every opcode fetch goes!
+            return self.prg_rom[self.read_offset[addr]]
+        if tag == REGION_RAM: # CPU RAM ($0000-$07FF mirrored up to $1FFF)
+            return self.cpu_ram[self.read_offset[addr]]
+        if tag == REGION_PPU: # PPU Registers (mirrored $2000-$2007 up to $3FFF)
+            return self.ppu.read_register(self.read_offset[addr])
+        if tag == REGION_CTRL: # Controller 1 Read
             if self.controller_strobe_mode: # When strobe is high, refresh with current A button state
                  # This is a simplification, usually it latches all buttons on strobe edge
                 val = 1 if self.controller_state['A'] else 0
             else: # Read one bit at a time from shift register
                 val = (self.controller_shift_register & 0x01)
                 self.controller_shift_register >>= 1
-            val |= 0x40 # Open bus behavior for unread bits
             # print(f"Ctrl Read: ${val:02X}")
-
-        elif 0x8000 <= addr <= 0xFFFF: # PRG ROM
-            # This is for Mapper 0 (NROM). Other mappers are more complex!
-            mapped_addr = (addr - 0x8000) % len(self.prg_rom)
-            val = self.prg_rom[mapped_addr]
+            return val | 0x40 # Open bus behavior for unread bits
         # else: print(f"Bus Read from unmapped address: ${addr:04X}")
-        return val
+        return 0x00 # Default read value
 
     def write(self, addr: int, val: int):
         addr &= 0xFFFF; val &= 0xFF
         if addr <= 0x1FFF: # CPU RAM
             self.cpu_ram[addr & 0x07FF] = val
+            if self.code_in_ram: # Self-modifying code? Forget every mirror of this byte!
+                base = addr & 0x07FF
+                cache = self.decode_cache
+                cache[base] = cache[base | 0x0800] = cache[base | 0x1000] = cache[base | 0x1800] = None
         elif 0x2000 <= addr <= 0x3FFF: # PPU Registers
             self.ppu.write_register(addr & 0x0007, val)
         elif addr == 0x4014: # OAMDMA Write ($4014) - Special PPU DMA!
@@ -495,8 +618,9 @@ class Bus:
 #       GUI Front-end - Now even cuter and faster!
 # -----------------------------------
 class EMUNESApp:
-    def __init__(self, root_window, auto_load_data: bytes = None):
+    def __init__(self, root_window, auto_load_data: bytes = None, profile_frames: int = 0):
         self.root = root_window
+        self.profile_frames = profile_frames # Frames to run under cProfile, 0 means no profiling!
         root_window.title("EMUNES 1.0A - Monika's Happy Fun Edition! 💖")
         root_window.configure(bg=DARK_BG)
         
@@ -526,12 +650,19 @@ class EMUNESApp:
         self.canvas_image_id = self.canvas.create_image((0,0), image=self.photo_image, anchor=tk.NW, tags="nes_screen")
         self.canvas.scale("nes_screen", 0, 0, 2.0, 2.0) # Scale it 2x!
 
-        self.is_running_emulation = False
+        # One emulation thread for the whole session, parked on _run_event while paused. No respawning, purr!
+        self._run_event = threading.Event()  # Set while the emulation should run
+        self._stop_event = threading.Event() # Set once, when the window is closing
         self.is_rom_loaded = False
-        self.emulation_thread = None
+        self.emulation_thread = threading.Thread(target=self._emulation_worker, daemon=True)
+        self.emulation_thread.start()
 
-        # Pre-generate color strings for the palette for super speedy updates!
-        self.tk_color_strings_cache = {} # Will be filled when PPU is ready
+        # Palette lookup tables, one 256-byte bytes.translate table per color channel (R, G, B)!
+        self._pal_rgb = None # Will be filled when PPU is ready
+        # The whole PPM file (header + pixels) lives in one buffer that every frame is painted into,
+        # so the header never gets glued onto a fresh pixel buffer again! (The row join, the three translates
+        # and the bytes() snapshot for Tk still allocate once per frame each, purr.)
+        self._ppm_frame = bytearray(PPM_HEADER) + bytearray(NES_WIDTH * NES_HEIGHT * 3)
 
         # Input handling - let's play!
         key_map = {'z':'A', 'x':'B', 'Return':'Start', 'Shift_L':'Select',
@@ -552,10 +683,22 @@ class EMUNESApp:
         if auto_load_data:
             self.load_rom_from_data(auto_load_data)
 
+    @property
+    def is_running_emulation(self) -> bool:
+        return self._run_event.is_set() and not self._stop_event.is_set()
+
+    @is_running_emulation.setter
+    def is_running_emulation(self, running: bool):
+        if running:
+            self._run_event.set()   # Wake the worker, zoom!
+        else:
+            self._run_event.clear() # Worker parks after its current frame
+
     def on_closing(self): # Gracefully stop emulation before closing!
         print("Closing EMUNES! Bye-bye for now, sweetie! 💕")
-        self.is_running_emulation = False # Signal thread to stop
-        if self.emulation_thread and self.emulation_thread.is_alive():
+        self._stop_event.set() # Signal thread to stop
+        self._run_event.set()  # ...and wake it up if it's napping so it can notice
+        if self.emulation_thread.is_alive():
             self.emulation_thread.join(timeout=1.0) # Wait a bit for thread
         self.root.destroy()
 
@@ -596,8 +739,8 @@ class EMUNESApp:
             # PPU is already created inside Bus, self.ppu is a shortcut if needed
             self.ppu = self.bus.ppu 
             
-            # Cache color strings from PPU's palette
-            self.tk_color_strings_cache = [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in self.ppu.nes_palette_rgb]
+            # The PPU keeps its palette as per-channel lookup tables too, just borrow them!
+            self._pal_rgb = self.ppu.palette_channels
 
             self.cpu.reset()
             self.ppu.reset()
@@ -621,22 +764,44 @@ class EMUNESApp:
             self.is_running_emulation = False
             self.run_button.config(text="Run! 🚀")
             self.status_label.config(text="Emulation Paused. Take a little break! ☕")
-            if self.emulation_thread and self.emulation_thread.is_alive():
-                # self.emulation_thread.join() # Wait for thread to finish current loop
-                pass # Let it finish its current iteration
+            # The worker finishes its current frame, then naps until we run again!
         else: # If paused or not started, then run
+            if not self.emulation_thread.is_alive(): # Worker fell over somehow? Give it a fresh start!
+                self.emulation_thread = threading.Thread(target=self._emulation_worker, daemon=True)
+                self.emulation_thread.start()
             self.is_running_emulation = True
             self.run_button.config(text="Pause! ⏸️")
             self.status_label.config(text="Emulation Running! Go go go! 🌟")
-            if not self.emulation_thread or not self.emulation_thread.is_alive():
-                self.emulation_thread = threading.Thread(target=self.emulation_loop, daemon=True)
-                self.emulation_thread.start()
+
+    def _emulation_worker(self):
+        # Lives as long as the window does, running frames whenever _run_event says so!
+        while not self._stop_event.is_set():
+            self._run_event.wait() # Sleepy time while paused, zero CPU, nya~
+            if self._stop_event.is_set():
+                break
+            try:
+                self.emulation_loop()
+            except Exception as e: # A CPU/bus hiccup must not take the worker down with it!
+                self._run_event.clear() # Park, so Run doesn't pretend things are running
+                if not self._stop_event.is_set():
+                    self.root.after(0, self._report_emulation_error, e) # Tk stuff belongs on the Tk thread
+                continue
+            if not self.is_rom_loaded: # Nothing to run, don't spin!
+                self._run_event.clear()
+
+    def _report_emulation_error(self, error: Exception):
+        self.run_button.config(text="Run! 🚀")
+        self.status_label.config(text=f"Emulation stopped: {error} 😿")
+        messagebox.showerror("Emulation Error! 😿", f"Oh noes! The emulator tripped: {error}")
 
     def emulation_loop(self):
         target_frame_time = 1.0 / 60.0  # Target 60 FPS, so exciting!
         
-        # Pre-allocate list for Tkinter row strings for speed!
-        tk_image_rows = [""] * NES_HEIGHT 
+        profiler = None
+        frames_profiled = 0
+        if self.profile_frames: # Let's see where the time goes, detective cat mode! 🔍
+            profiler = cProfile.Profile()
+            profiler.enable()
 
         while self.is_running_emulation and self.is_rom_loaded:
             frame_start_time = time.perf_counter()
@@ -650,17 +815,27 @@ class EMUNESApp:
             
             cycles_this_frame = 0
             target_cycles_for_frame = 29781 # NTSC CPU cycles
-            
+
+            # Pre-bind everything the monster loop touches, LOAD_FAST is way cheaper than attribute chains, purr!
+            ppu = self.ppu
+            cpu_step = self.cpu.step
+            cpu_nmi = self.cpu.nmi
+            ppu_tick = ppu.tick
+            poll_countdown = RUN_FLAG_POLL_INTERVAL
+
             while cycles_this_frame < target_cycles_for_frame:
-                if self.ppu.nmi_occurred: # Check for NMI from PPU!
-                    self.cpu.nmi()
-                    self.ppu.nmi_occurred = False # NMI handled by CPU!
+                if ppu.nmi_occurred: # Check for NMI from PPU!
+                    cpu_nmi()
+                    ppu.nmi_occurred = False # NMI handled by CPU!
                 
-                cycles_executed_this_step = self.cpu.step() # CPU executes one instruction
-                self.ppu.tick(cycles_executed_this_step)    # PPU ticks based on CPU cycles
+                cycles_executed_this_step = cpu_step() # CPU executes one instruction
+                ppu_tick(cycles_executed_this_step)    # PPU ticks based on CPU cycles
                 cycles_this_frame += cycles_executed_this_step
                 
-                if not self.is_running_emulation: break # Exit early if paused
+                poll_countdown -= 1
+                if not poll_countdown: # Only peek at the pause flag every so often!
+                    if not self.is_running_emulation: break # Exit early if paused
+                    poll_countdown = RUN_FLAG_POLL_INTERVAL
             
             if not self.is_running_emulation: break # Exit loop if paused during cycle accumulation
 
@@ -668,44 +843,92 @@ class EMUNESApp:
             # PPU render() returns a 2D list of palette indices
             frame_palette_indices = self.ppu.render() 
 
-            # Convert palette indices to Tkinter color strings super fast!
-            for y in range(NES_HEIGHT):
-                # Using list comprehension for speed here, meow!
-                row_pixel_strings = [self.tk_color_strings_cache[frame_palette_indices[y][x]] 
-                                     for x in range(NES_WIDTH)]
-                tk_image_rows[y] = "{" + " ".join(row_pixel_strings) + "}"
+            # Convert palette indices to raw RGB bytes super fast! No color strings at all, meow!
+            ppm_frame = self._indices_to_ppm(frame_palette_indices)
             
-            # Update Tkinter PhotoImage, row by row efficiently!
+            # Update Tkinter PhotoImage with one binary PPM, Tk parses it in C!
             # Make sure this is done in the main thread if Tkinter requires it.
             # For now, direct update from thread. If issues, use root.after().
             try:
-                for y_coord, row_data_str in enumerate(tk_image_rows):
-                    self.photo_image.put(row_data_str, to=(0, y_coord))
+                # Tk only takes real bytes objects (a bytearray would get stringified), so one snapshot copy per frame!
+                self.photo_image.configure(data=bytes(ppm_frame), format="PPM")
             except tk.TclError as e: # Catch error if GUI is closed while thread is running
                  print(f"GUI Error during render: {e}. Might be closing, teehee!")
                  self.is_running_emulation = False # Stop the loop
                  break
 
 
+            if profiler:
+                frames_profiled += 1
+                if frames_profiled >= self.profile_frames:
+                    self._finish_profile(profiler, frames_profiled)
+                    profiler = None
+
             # --- Frame Limiting ---
-            elapsed_time = time.perf_counter() - frame_start_time
-            sleep_duration = target_frame_time - elapsed_time
-            if sleep_duration > 0:
-                time.sleep(sleep_duration)
+            frame_deadline = frame_start_time + target_frame_time
+            sleep_duration = frame_deadline - time.perf_counter()
+            if sleep_duration > 2 * SLEEP_SPIN_MARGIN:
+                time.sleep(sleep_duration - SLEEP_SPIN_MARGIN) # Big nap first...
+            while time.perf_counter() < frame_deadline:
+                pass # ...then a tiny spin to land right on time, purr!
             
             # Update FPS or status if you want!
             # current_fps = 1.0 / (time.perf_counter() - frame_start_time)
             # print(f"FPS: {current_fps:.2f}")
 
+        if profiler: # Paused before reaching the target, still show what we've got!
+            self._finish_profile(profiler, frames_profiled)
+
         print("Emulation loop finished or paused. Have a happy day! ☀️")
-        if self.is_rom_loaded and not self.is_running_emulation : # If paused by user
+        if self.is_rom_loaded and not self.is_running_emulation and not self._stop_event.is_set(): # If paused by user
              self.run_button.config(text="Run! 🚀")
              self.status_label.config(text="Emulation Paused. Waiting for more fun! ☕")
 
+    def _indices_to_ppm(self, frame_palette_indices) -> bytearray:
+        # One table lookup per channel over the whole frame, then interleave with strided slices
+        # straight into the preallocated PPM buffer, right after the header. All in C!
+        # Still allocates: the joined index plane and one translate result per channel, each freed right away.
+        indices = b"".join(frame_palette_indices)
+        ppm_frame = self._ppm_frame
+        start = len(PPM_HEADER)
+        for channel, table in enumerate(self._pal_rgb):
+            ppm_frame[start + channel::3] = indices.translate(table)
+        return ppm_frame
+
+    def _finish_profile(self, profiler: cProfile.Profile, frames: int):
+        profiler.disable()
+        self.profile_frames = 0 # Only profile the first run, no need to do it twice!
+        profiler.dump_stats(PROFILE_STATS_FILE)
+        print(f"Profiled {frames} frames! Stats saved to '{PROFILE_STATS_FILE}'. Top hotspots, nya:")
+        pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(20)
+
+
+def set_high_res_timer(enabled: bool):
+    # Windows sleeps in ~15.6ms ticks by default, ask for 1ms ticks while we run! Other OSes are already fine.
+    if sys.platform != "win32":
+        return
+    import ctypes
+    winmm = ctypes.windll.winmm
+    if enabled:
+        winmm.timeBeginPeriod(1)
+    else:
+        winmm.timeEndPeriod(1)
+
+
+def parse_profile_frames(argv) -> int:
+    # "--profile [N]" on the command line, or EMUNES_PROFILE=N in the environment!
+    if "--profile" in argv:
+        i = argv.index("--profile")
+        if i + 1 < len(argv) and argv[i + 1].isdigit():
+            return int(argv[i + 1])
+        return PROFILE_DEFAULT_FRAMES
+    env_value = os.environ.get("EMUNES_PROFILE", "")
+    return int(env_value) if env_value.isdigit() else 0
+
 
 if __name__ == "__main__":
     main_window = tk.Tk()
-    app = EMUNESApp(main_window)
+    app = EMUNESApp(main_window, profile_frames=parse_profile_frames(sys.argv[1:]))
     # Example: auto-load a ROM (replace with your ROM path or remove)
     # try:
     #    with open("your_test_rom.nes", "rb") as f: test_rom_data = f.read()
@@ -713,4 +936,8 @@ if __name__ == "__main__":
     # except FileNotFoundError:
     #    print("Test ROM not found, please load one manually, sweetie! 😊")
     
-    main_window.mainloop()
+    set_high_res_timer(True)
+    try:
+        main_window.mainloop()
+    finally:
+        set_high_res_timer(False)
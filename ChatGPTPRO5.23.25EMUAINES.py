@@ -16,6 +16,7 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import time
 import threading
+import queue
 
 # ---------------------------------------------------------
 # Theme / Constants
@@ -27,6 +28,27 @@ NES_WIDTH, NES_HEIGHT = 256, 240
 TILE_W = TILE_H = 8
 MAP_W, MAP_H = NES_WIDTH // TILE_W, NES_HEIGHT // TILE_H  # 32 × 30 tiles
 
+PPM_HEADER = b"P6\n%d %d\n255\n" % (NES_WIDTH, NES_HEIGHT)
+
+
+def _spread_bits(byte: int) -> int:
+    """Move bit 7-x of a bitplane byte to bit 0 of output byte x (big-endian)."""
+    spread = 0
+    for x in range(8):
+        if byte & (0x80 >> x):
+            spread |= 1 << (8 * (7 - x))
+    return spread
+
+
+# SWAR row decode: BIT_SPREAD[p0] | BIT_SPREAD[p1] << 1 is 8 pixels in one int
+BIT_SPREAD = tuple(_spread_bits(b) for b in range(256))
+
+
+def palette_channel_tables(palette):
+    """Split (r, g, b) tuples into three 256-byte R/G/B translate tables."""
+    return tuple(bytes(rgb[ch] for rgb in palette).ljust(256, b"\x00") for ch in range(3))
+
+
 INES_HEADER_SIZE = 16
 PRG_PAGE = 16 * 1024
 CHR_PAGE = 8 * 1024
@@ -41,6 +63,7 @@ B_FLAG = 1 << 4
 U_FLAG = 1 << 5
 V_FLAG = 1 << 6
 N_FLAG = 1 << 7
+ZN_CLEAR = ~(Z_FLAG | N_FLAG) & 0xFF  # status mask that drops Z and N
 
 
 # ---------------------------------------------------------
@@ -71,28 +94,19 @@ class CPU6502:
         self.status = U_FLAG | I_FLAG
         self.cycles = 0
 
-        # opcode dispatch table
-        self.ops = {
-            0xEA: self.op_nop,
-            0xA9: self.op_lda_imm,
-            0xA2: self.op_ldx_imm,
-            0xAD: self.op_lda_abs,
-            0x8D: self.op_sta_abs,
-            0x9A: self.op_txs,
-            0x78: self.op_sei,
-            0x4C: self.op_jmp_abs,
-        }
-
-    # flag helpers ------------------------------------------------------
-    def _set(self, m, v):
-        if v:
-            self.status |= m
-        else:
-            self.status &= ~m
-
-    def _update_zn(self, v):
-        self._set(Z_FLAG, v == 0)
-        self._set(N_FLAG, v & 0x80)
+        # opcode dispatch table: one slot per opcode, NOP for the unimplemented
+        self.ops = [self.op_nop] * 256
+        for op, fn in (
+            (0xEA, self.op_nop),
+            (0xA9, self.op_lda_imm),
+            (0xA2, self.op_ldx_imm),
+            (0xAD, self.op_lda_abs),
+            (0x8D, self.op_sta_abs),
+            (0x9A, self.op_txs),
+            (0x78, self.op_sei),
+            (0x4C, self.op_jmp_abs),
+        ):
+            self.ops[op] = fn
 
     # bus helpers -------------------------------------------------------
     def _fetch(self):
@@ -108,9 +122,11 @@ class CPU6502:
         print(f"CPU reset: PC=${self.pc:04X}")
 
     def step(self):
-        op = self._fetch()
+        pc = self.pc
+        op = self.bus.read(pc)
+        self.pc = (pc + 1) & 0xFFFF
         before = self.cycles
-        self.ops.get(op, self.op_nop)()
+        self.ops[op]()
         used = self.cycles - before or 2
         return used
 
@@ -119,21 +135,21 @@ class CPU6502:
         self.cycles += 2
 
     def op_lda_imm(self):
-        self.a = self._fetch()
-        self._update_zn(self.a)
+        self.a = v = self._fetch()
+        self.status = (self.status & ZN_CLEAR) | (v & N_FLAG) | (v == 0) << 1
         self.cycles += 2
 
     def op_ldx_imm(self):
-        self.x = self._fetch()
-        self._update_zn(self.x)
+        self.x = v = self._fetch()
+        self.status = (self.status & ZN_CLEAR) | (v & N_FLAG) | (v == 0) << 1
         self.cycles += 2
 
     def op_lda_abs(self):
         lo = self._fetch()
         hi = self._fetch()
         addr = (hi << 8) | lo
-        self.a = self.bus.read(addr)
-        self._update_zn(self.a)
+        self.a = v = self.bus.read(addr)
+        self.status = (self.status & ZN_CLEAR) | (v & N_FLAG) | (v == 0) << 1
         self.cycles += 4
 
     def op_sta_abs(self):
@@ -148,7 +164,7 @@ class CPU6502:
         self.cycles += 2
 
     def op_sei(self):
-        self._set(I_FLAG, True)
+        self.status |= I_FLAG
         self.cycles += 2
 
     def op_jmp_abs(self):
@@ -161,32 +177,46 @@ class CPU6502:
 # ---------------------------------------------------------
 # PPU stub – checkerboard / tileset view
 # ---------------------------------------------------------
+def decode_chr_to_tileset(chr_bytes: bytes) -> bytes:
+    """Decode the first 32×30 CHR tiles straight into a flat 256×240 frame.
+
+    Each tile is 16 bytes (8 for plane0, 8 for plane1); tiles that run past
+    the end of the CHR data stay blank.
+    """
+    out = bytearray(NES_WIDTH * NES_HEIGHT)
+    n = len(chr_bytes)
+    spread = BIT_SPREAD
+    for ty in range(MAP_H):
+        for tx in range(MAP_W):
+            off = (ty * MAP_W + tx) * 16
+            if off + 16 > n:
+                continue
+            pos = ty * TILE_H * NES_WIDTH + tx * TILE_W
+            for y in range(TILE_H):
+                row = spread[chr_bytes[off + y]] | spread[chr_bytes[off + y + 8]] << 1
+                out[pos : pos + 8] = row.to_bytes(8, "big")
+                pos += NES_WIDTH
+    return bytes(out)
+
+
 class PPU2C02:
+    # tick() is a no-op until real PPU timing lands; the emulation loop skips it
+    has_timing = False
+
     def __init__(self, chr_data: bytes):
         self.chr = chr_data
-        self.screen = [[0] * NES_WIDTH for _ in range(NES_HEIGHT)]
+        # One flat 256×240 frame of palette indices, pixel (x, y) at screen[y*NES_WIDTH + x]
+        self.screen = bytearray(NES_WIDTH * NES_HEIGHT)
         # Some basic palette stub
         self.palette = [
             (84, 84, 84), (0, 30, 116), (8, 16, 144), (48, 0, 136)
         ] + [(0, 0, 0)] * 60
+        # The same palette split per channel (R, G, B) as 256-byte translate tables
+        self.palette_channels = palette_channel_tables(self.palette)
         self.show_tileset = False
-
-    def _decode_tile(self, idx: int):
-        # Each tile is 16 bytes (8 for plane0, 8 for plane1)
-        off = idx * 16
-        if off + 16 > len(self.chr):
-            return [[0]*TILE_W for _ in range(TILE_H)]
-        tile = []
-        for y in range(8):
-            p0 = self.chr[off + y]
-            p1 = self.chr[off + y + 8]
-            row = []
-            for b in range(8):
-                bit0 = (p0 >> (7 - b)) & 1
-                bit1 = (p1 >> (7 - b)) & 1
-                row.append(bit0 | (bit1 << 1))
-            tile.append(row)
-        return tile
+        # CHR ROM never changes, so the whole tileset view is decoded once up front
+        self._tileset_frame = decode_chr_to_tileset(self.chr) if self.chr else None
+        self._checker_cache = None  # checkerboard frame, built on first use
 
     def tick(self, _cyc):
         # Not implementing PPU timing for this minimal test
@@ -194,25 +224,22 @@ class PPU2C02:
 
     def render(self):
         """Render either a checkerboard background or the CHR as a tileset."""
-        if self.show_tileset and self.chr:
-            for ty in range(MAP_H):
-                for tx in range(MAP_W):
-                    idx = ty * MAP_W + tx
-                    tile = self._decode_tile(idx)
-                    for py in range(TILE_H):
-                        row_dst = self.screen[ty * TILE_H + py]
-                        row_src = tile[py]
-                        for px in range(TILE_W):
-                            row_dst[tx * TILE_W + px] = row_src[px]
+        screen = self.screen
+        if self.show_tileset and self._tileset_frame:
+            screen[:] = self._tileset_frame
         else:
-            # Draw simple checkerboard
-            blk = 16
-            for y in range(NES_HEIGHT):
-                yb = (y // blk) & 1
-                row = self.screen[y]
-                for x in range(NES_WIDTH):
-                    row[x] = ((x // blk) & 1) ^ yb
-        return self.screen
+            if self._checker_cache is None:
+                self._checker_cache = self._build_checkerboard()
+            screen[:] = self._checker_cache
+        return screen
+
+    @staticmethod
+    def _build_checkerboard(blk=16):
+        """Simple 16×16 checkerboard as one flat frame (bytes)."""
+        # Only two distinct rows, each repeated in bands of blk scanlines
+        even = (bytes(blk) + b"\x01" * blk) * (NES_WIDTH // (2 * blk))
+        odd = (b"\x01" * blk + bytes(blk)) * (NES_WIDTH // (2 * blk))
+        return b"".join((odd if (y // blk) & 1 else even) for y in range(NES_HEIGHT))
 
 
 # ---------------------------------------------------------
@@ -223,25 +250,51 @@ class Bus:
         self.prg = prg
         self.ram = bytearray(0x0800)
         self.ppu = PPU2C02(chr_)
+        self._read_tbl, self._write_tbl = self._build_tables()
 
-    def read(self, addr):
-        addr &= 0xFFFF
-        if addr < 0x2000:
-            return self.ram[addr & 0x07FF]
-        elif addr >= 0x8000:
-            # Mirror if PRG is smaller than 0x8000 block
-            return self.prg[(addr - 0x8000) % len(self.prg)]
+    def _build_tables(self):
+        """One read and one write handler per 1 KB page, indexed by addr >> 10."""
+        ram, prg = self.ram, self.prg
+        size = len(prg)
+
+        def read_ram(addr):
+            return ram[addr & 0x07FF]
+
+        if size and not size & (size - 1):
+            mask = size - 1
+
+            def read_prg(addr):
+                # Mirror if PRG is smaller than 0x8000 block
+                return prg[(addr - 0x8000) & mask]
         else:
+            def read_prg(addr):
+                return prg[(addr - 0x8000) % size]
+
+        def read_open(addr):
             # Not handling PPU registers, etc. in this minimal test
             return 0
 
+        def write_ram(addr, val):
+            ram[addr & 0x07FF] = val & 0xFF
+
+        def write_none(addr, val):
+            # Not writing to PPU registers in minimal test
+            pass
+
+        read_tbl = [read_ram] * 8 + [read_open] * 24 + [read_prg] * 32
+        write_tbl = [write_ram] * 8 + [write_none] * 56
+        return read_tbl, write_tbl
+
+    def read(self, addr):
+        return self._read_tbl[addr >> 10](addr)
+
     def write(self, addr, val):
-        addr &= 0xFFFF
-        val &= 0xFF
-        if addr < 0x2000:
-            self.ram[addr & 0x07FF] = val
-        # Not writing to PPU registers in minimal test
+        self._write_tbl[addr >> 10](addr, val)
+
 
+FRAME_PUMP_MS = 16  # ~60 Hz poll of the frame queue on the Tk thread
+FRAME_TIME = 1.0 / 60.0  # emulation pacing target
+MAX_FRAME_SKIP = 5  # render at least every Nth slice even when behind
 
 # ---------------------------------------------------------
 # Tkinter GUI wrapper
@@ -284,6 +337,14 @@ class EMUNESApp:
         self.cpu = None
         self.running = False
         self.thread = None
+        self._palette_rgb = ()  # R, G, B translate tables (256 bytes each)
+        self._last_rendered_hash = None  # hash of the last screen handed to Tk
+        self._dirty = False  # view changed; the pump redraws once it is safe
+
+        # Finished frames travel emulation thread -> Tk thread through a
+        # one-slot queue; only the newest frame is ever kept.
+        self._frames = queue.Queue(maxsize=1)
+        self._pump_id = self.root.after(FRAME_PUMP_MS, self._pump_frame)
 
     def _load_rom(self):
         path = filedialog.askopenfilename(filetypes=[("NES ROMs", "*.nes")])
@@ -301,6 +362,8 @@ class EMUNESApp:
             self.bus = Bus(prg, chr_)
             self.cpu = CPU6502(self.bus)
             self.cpu.reset()
+            self._palette_rgb = self.bus.ppu.palette_channels
+            self._last_rendered_hash = None
 
             self.status_lbl.config(text=f"Loaded: {path.split('/')[-1]}")
             self.run_btn.state(["!disabled"])
@@ -325,50 +388,110 @@ class EMUNESApp:
         ppu.show_tileset = not ppu.show_tileset
         new_text = "Pattern" if ppu.show_tileset else "Tileset"
         self.view_btn.config(text=new_text)
-        # Force a refresh of the screen
-        self._draw_frame()
+        # Ask for a refresh; _pump_frame decides who renders it
+        self._dirty = True
 
     def _emulation_loop(self):
-        """Runs CPU in a loop while self.running is True."""
+        """Runs CPU in a loop while self.running is True.
+
+        Paced against a 60 Hz deadline: when a slice overruns, the next one
+        runs without rendering (up to MAX_FRAME_SKIP in a row), and a frame
+        identical to the last one shown is never re-uploaded.
+        """
+        next_deadline = time.perf_counter()
+        skipped = 0
         while self.running:
             if self.cpu:
                 # Step ~30,000 cycles to keep CPU busy,
                 # then draw a frame
                 cyc_target = 30000
                 cyc_count = 0
-                while cyc_count < cyc_target:
-                    used = self.cpu.step()
-                    cyc_count += used
-                    self.bus.ppu.tick(used)
-                # Once we exit that small loop, we draw the screen
+                cpu_step = self.cpu.step
+                ppu = self.bus.ppu
+                if ppu.has_timing:
+                    ppu_tick = ppu.tick
+                    while cyc_count < cyc_target:
+                        used = cpu_step()
+                        cyc_count += used
+                        ppu_tick(used)
+                else:
+                    while cyc_count < cyc_target:
+                        cyc_count += cpu_step()
+
+                next_deadline += FRAME_TIME
+                frames_behind = int((time.perf_counter() - next_deadline) / FRAME_TIME)
+                if frames_behind > 0 and skipped < MAX_FRAME_SKIP:
+                    skipped += 1
+                    continue  # behind schedule: emulate again before drawing
+                skipped = 0
+
+                # Once we exit that small loop, hand the frame to Tk if it changed
+                scr = ppu.render()
+                frame_hash = hash(bytes(scr))
+                if frame_hash != self._last_rendered_hash:
+                    self._last_rendered_hash = frame_hash
+                    self._post_frame(self._render_pixels(scr))
+
+                delay = next_deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif frames_behind > MAX_FRAME_SKIP:
+                    next_deadline = time.perf_counter()  # too far behind; stop chasing
+
+    def _render_pixels(self, scr):
+        """Converts a flat screen of palette indices to raw RGB bytes (any thread)."""
+        # One translate per channel maps the whole frame in C, then strided
+        # slice writes interleave R, G, B; Tk gets one binary PPM for the
+        # frame instead of parsing 61k "#rrggbb" strings.
+        rgb = bytearray(len(scr) * 3)
+        for ch, table in enumerate(self._palette_rgb):
+            rgb[ch::3] = scr.translate(table)
+        return bytes(rgb)
+
+    def _post_frame(self, pixels):
+        """Queues a frame for the Tk thread, replacing any unshown one."""
+        try:
+            self._frames.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._frames.put_nowait(pixels)
+        except queue.Full:
+            pass  # Tk thread raced us; the next frame will land
+
+    def _pump_frame(self):
+        """Tk-thread poll: shows the newest queued frame, then reschedules."""
+        try:
+            pixels = self._frames.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self._show_pixels(pixels)
+        if self._dirty:
+            if self.running:
+                # The emulation loop renders the new view on its next frame
+                self._dirty = False
+            elif not (self.thread and self.thread.is_alive()):
+                # Paused and the loop has fully stopped: safe to render here
+                self._dirty = False
                 self._draw_frame()
+        self._pump_id = self.root.after(FRAME_PUMP_MS, self._pump_frame)
+
+    def _show_pixels(self, pixels):
+        """Uploads raw RGB bytes into the PhotoImage (Tk thread only)."""
+        self.photo.configure(data=PPM_HEADER + pixels, format="PPM")
 
     def _draw_frame(self):
-        """Renders the current PPU screen into the PhotoImage."""
+        """Renders the current PPU screen straight into the PhotoImage (Tk thread only)."""
         if not self.bus:
             return
-        scr = self.bus.ppu.render()  # 2D array of palette indices
-        ppu = self.bus.ppu
-        pal = ppu.palette
-
-        # Construct one giant string of pixel data in PPM style
-        # for PhotoImage's put() method. This is usually faster than
-        # calling put() per pixel in a loop.
-        data_rows = []
-        for row in scr:
-            row_data = []
-            for pix_val in row:
-                r, g, b = pal[pix_val]
-                row_data.append(f"#{r:02x}{g:02x}{b:02x}")
-            data_rows.append(" ".join(row_data))
-        # Put this into PhotoImage
-        self.photo.put(" ".join(data_rows), to=(0, 0))
-
-        # Force the canvas to redraw
-        self.canvas.update()
+        scr = self.bus.ppu.render()
+        self._last_rendered_hash = hash(bytes(scr))
+        self._show_pixels(self._render_pixels(scr))
 
     def _quit(self):
         self.running = False
+        self.root.after_cancel(self._pump_id)
         self.root.destroy()
 
 
@@ -1,7 +1,16 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk, Scale # We're using ttk for super cute tabs now! So much more organized!
 import struct # For potential future binary operations, maybe for endianness for hex editor, how exciting!
+import binascii # Hexlify whole rows in C for the hex editor, zoom!
 import random # For the glorious DAMNATION ENGINE! Let's make things fucking unpredictable!
+import mmap # Map the ROM file straight into memory, no bulk copy on open!
+import os
+import operator # C-level xor/add/and for our mutation pipelines, no Python lambdas per byte!
+from collections import deque
+from itertools import repeat, filterfalse
+from array import array
+from bisect import bisect_left
+from functools import lru_cache # Don't rebuild the same dump twice, work smarter not harder!
 
 # --- Constants for the "Nesticle" Dark Theme ---
 BG_COLOR = "#101010" # Dark as a demon's asshole
@@ -20,16 +29,107 @@ FONT_SIZE_NORMAL = 10
 FONT_SIZE_HEADER = 16
 FONT_SIZE_TITLE = 20
 
+# Hex editor ASCII column: printable bytes stay, everything else turns into a dot. One C translate per row!
+_PRINTABLE = bytes(b if 0x20 <= b < 0x7F else 0x2E for b in range(256))
+
+DIRTY_PAGE_SIZE = 4096 # Saves only rewrite the 4 KB pages we actually fucked with!
+
+OPCODE_PREVIEW_BYTES = 32 # How many PRG bytes the info tab shows off
+
+# "$00".."$FF" for the opcode preview, formatted once instead of per byte per call!
+_OPCODE_STR = tuple(f"${b:02X}" for b in range(256))
+
+# One hex editor row: "rel (abs): hex bytes  ascii". Bound once, no f-string to evaluate per row!
+_HEX_ROW = "{:04X} ({:08X}): {:<48} {}\n".format
+
+HEX_REFRESH_DEBOUNCE_MS = 75 # Typing in the hex controls redraws once you pause, not on every damn keystroke!
+
+HEX_VIEW_MARGIN_ROWS = 32 # The hex view only formats the rows on screen, plus this many on either side for smooth scrolling
+
+BYTE_SHIFT_RANGE = range(-15, 16) # Byte Shift Storm nudges each victim byte by -15..+15, more chaotic shift!
+
+@lru_cache(maxsize=32)
+def _compile_needle(hex_str):
+    # Hex search string -> raw bytes, parsed once and remembered, so re-running the same search skips the parse!
+    return bytes.fromhex(hex_str)
+
+def _find_all(haystack, needle, start, end):
+    # Every (overlapping) hit of needle in haystack[start:end], using the C substring searcher and no slicing copies!
+    hits = []
+    i = haystack.find(needle, start, end)
+    while i >= 0:
+        hits.append(i)
+        i = haystack.find(needle, i + 1, end) # +1 so overlapping matches still count!
+    return hits
+
+def _scatter(buf, indices, values):
+    # buf[i] = v for every (i, v) pair, driven entirely from C by map() - deque(maxlen=0) just eats the Nones!
+    deque(map(buf.__setitem__, indices, values), maxlen=0)
+
+def _sample_indices(rng, n, k):
+    # k distinct victims out of range(n), without random.sample's per-pick Python loop!
+    # Draw random 32-bit ints in bulk, fold them into range(n) and let a dict dedupe them - all in C.
+    if k * 2 > n: # Picking most of them? Pick the few survivors instead and take everything else, way fewer draws!
+        survivors = set(_sample_indices(rng, n, n - k))
+        return list(filterfalse(survivors.__contains__, range(n)))
+    picked = {}
+    while len(picked) < k:
+        need = k - len(picked)
+        draws = array("I", rng.randbytes(4 * (need + need // 4 + 16))) # A little extra for the duplicates
+        picked.update(dict.fromkeys(map(n.__rmod__, draws))) # n.__rmod__(x) is x % n, done in C!
+    return list(picked)[:k]
+
+# --- DAMNATION KERNELS: one fused gather -> mangle -> scatter pass per mode, all on the raw byte buffer! ---
+def xor_mayhem(buf, indices, key, rng):
+    _scatter(buf, indices, map(operator.xor, map(buf.__getitem__, indices), repeat(key)))
+
+def random_garbage_fill(buf, indices, key, rng):
+    _scatter(buf, indices, rng.randbytes(len(indices)))
+
+def byte_shift_storm(buf, indices, key, rng):
+    shifts = rng.choices(BYTE_SHIFT_RANGE, k=len(indices))
+    _scatter(buf, indices, map(operator.and_, map(operator.add, map(buf.__getitem__, indices), shifts), repeat(0xFF))) # & 0xFF wraps to a byte, no division!
+
+DAMNATION_KERNELS = {
+    "XOR Mayhem": xor_mayhem,
+    "Random Garbage Fill": random_garbage_fill,
+    "Byte Shift Storm": byte_shift_storm,
+    # Add more fucked up modes here later, this is just the beginning!
+}
+
 class NESRom:
     def __init__(self, filepath):
-        self.filepath = filepath # Store original path for saving later! Purr-fect for keeping track!
+        self._set_filepath(filepath) # Store original path for saving later! Purr-fect for keeping track!
         with open(filepath, "rb") as f:
-            self.data = bytearray(f.read()) # Use bytearray for mutability! So much fun to change things!
+            try:
+                # Copy-on-write mapping: the OS pages the file in on demand and only the bytes we fuck with get copied!
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                self.data = memoryview(self._mm) # Mutable, sliceable, indexable - same API as the old bytearray!
+            except ValueError: # Empty files can't be mapped, just read whatever's there
+                self._mm = None
+                self.data = bytearray(f.read())
+        # Bumped on every mutation. The opcode cache and the tab redraw checks are keyed on it, so stale text can never leak out!
+        self._version = 0
+        # One flag per DIRTY_PAGE_SIZE page of self.data that differs from what's on disk at _clean_path.
+        # The file we just loaded IS our clean copy, so nothing's dirty yet!
+        self._dirty_pages = bytearray(-(-len(self.data) // DIRTY_PAGE_SIZE))
+        self._clean_path = filepath
+        self._source_path = filepath # The file the mapping (if any) sits on, no matter where we save later
+        self._rng = random.Random() # Our very own chaos generator for the Damnation Engine!
+        self._opcodes_cached = lru_cache(maxsize=8)(self._build_opcodes)
         self.header = self.data[:16]
         self.valid = self.parse_header()
         if self.valid:
+            # INVARIANT: prg_rom/chr_rom are live views into self.data, so this runs ONCE per load!
+            # Edits go into self.data and the views see them for free. Only rebinding self.data needs a re-extract.
             self.extract_rom_data()
 
+    def _set_filepath(self, filepath):
+        # Work out the display names ONCE per path, with os.path so Windows backslashes don't fuck it up!
+        self.filepath = filepath
+        self.basename = os.path.basename(filepath)
+        self.stem = os.path.splitext(self.basename)[0]
+
     def parse_header(self):
         if self.header[:4] != b"NES\x1a":
             return False
@@ -44,21 +144,60 @@ class NESRom:
 
     def extract_rom_data(self):
         # Time to slice and dice that ROM data, nyah! We're becoming data ninjas!
+        # Call this only when self.data itself gets replaced, never after a poke - the views are already up to date!
         self.trainer_size = 512 if self.trainer else 0
         self.prg_rom_offset = 16 + self.trainer_size
         self.chr_rom_offset = self.prg_rom_offset + self.prg_rom_size
 
-        self.prg_rom = self.data[self.prg_rom_offset : self.prg_rom_offset + self.prg_rom_size]
-        self.chr_rom = self.data[self.chr_rom_offset : self.chr_rom_offset + self.chr_rom_size]
+        # Zero-copy views straight into self.data! Poke self.data and these see it instantly, no re-extract needed!
+        data_view = memoryview(self.data)
+        self.prg_rom = data_view[self.prg_rom_offset : self.prg_rom_offset + self.prg_rom_size]
+        self.chr_rom = data_view[self.chr_rom_offset : self.chr_rom_offset + self.chr_rom_size]
 
     def get_opcodes(self, count=16):
         # Peeking at the very first bytes of PRG ROM! So intriguing, like a secret message!
+        return self._opcodes_cached(self._version, count)
+
+    def _build_opcodes(self, version, count):
         if not hasattr(self, "prg_rom"):
             return []
-        return [f"${byte:02X}" for byte in self.prg_rom[:count]]
+        return list(map(_OPCODE_STR.__getitem__, self.prg_rom[:count]))
 
     def get_hex_dump(self, offset, length, rom_type="PRG"):
         # Let's get a super cool hex dump, yay! It's like seeing the ROM's inner thoughts!
+        # No cache: the hex view only ever builds the rows on screen, so whole dumps are a rare treat!
+        return self._build_hex_dump(offset, length, rom_type)
+
+    def hex_dump_span(self, offset, length, rom_type):
+        # (first byte, row count) of the dump of (offset, length, rom_type), or None if all you'd get is an error message
+        section = getattr(self, "prg_rom" if rom_type == "PRG" else "chr_rom" if rom_type == "CHR" else "", None)
+        if not section:
+            return None
+        start = max(0, min(offset, len(section)))
+        shown = min(length, len(section) - start)
+        return start, max(0, -(-shown // 16)) # The last row always shows a full 16 bytes
+
+    def hex_dump_window(self, offset, length, rom_type, first_row, row_count):
+        # Rows first_row .. first_row+row_count-1 of the dump of (offset, length, rom_type), built fresh - never the whole damn dump!
+        start, _ = self.hex_dump_span(offset, length, rom_type)
+        return self._build_hex_dump(start + first_row * 16, row_count * 16, rom_type)
+
+    def hex_dump_rows(self, offset, length, rom_type, indices, only_rows=None):
+        # Only the rows of the dump of (offset, length, rom_type) holding one of the (sorted) section indices,
+        # as {row number: row text}. Damnation hits k bytes, so we rebuild k rows tops instead of the whole dump!
+        # only_rows, if given, skips rows nobody's looking at anyway.
+        span = self.hex_dump_span(offset, length, rom_type)
+        if span is None:
+            return {}
+        start, row_count = span
+        rows = {}
+        for i in indices[bisect_left(indices, start):bisect_left(indices, start + row_count * 16)]:
+            row = (i - start) // 16
+            if row not in rows and (only_rows is None or row in only_rows):
+                rows[row] = self._build_hex_dump(start + row * 16, 16, rom_type)
+        return rows
+
+    def _build_hex_dump(self, offset, length, rom_type):
         data_to_dump = None
         start_addr = 0 # This is the address WITHIN the PRG/CHR section for display
         abs_start_addr_rom = 0 # This is the absolute address in the FULL ROM file for display
@@ -77,18 +216,18 @@ class NESRom:
         if not data_to_dump:
             return "No data available, load a goddamn ROM first, dumbass! We need bytes to fuck with!"
 
-        dump_str = ""
+        rows = [] # Collect rows and join once at the end, no quadratic string += pileup!
         # Offset here is relative to the start of the selected PRG/CHR data
         actual_offset = max(0, min(offset, len(data_to_dump)))
         actual_length = min(length, len(data_to_dump) - actual_offset)
 
         for i in range(actual_offset, actual_offset + actual_length, 16):
             chunk = data_to_dump[i:i+16]
-            hex_part = " ".join([f"{byte:02X}" for byte in chunk])
-            ascii_part = "".join([chr(byte) if 32 <= byte < 127 else "." for byte in chunk])
+            hex_part = binascii.hexlify(chunk, b" ").decode("ascii").upper() # One C call per row, no per-byte f-strings!
+            ascii_part = chunk.tobytes().translate(_PRINTABLE).decode("latin-1")
             # Display address relative to selected ROM section, and absolute in file
-            dump_str += f"{start_addr + i:04X} ({abs_start_addr_rom + i:08X}): {hex_part:<48} {ascii_part}\n"
-        return dump_str
+            rows.append(_HEX_ROW(start_addr + i, abs_start_addr_rom + i, hex_part, ascii_part))
+        return "".join(rows)
 
     def modify_byte(self, rom_type, address_in_rom, new_value):
         # Oh my goodness, we're changing bytes! Super powerful, you're a byte-bending wizard now!
@@ -115,8 +254,9 @@ class NESRom:
                 raise ValueError(f"Address {address_in_rom:04X} out of {rom_type} ROM bounds! Stay within the goddamn lines!")
 
             if abs_address != -1 and 0 <= abs_address < len(self.data):
-                self.data[abs_address] = new_byte # The actual byte modification! Woohoo!
-                self.extract_rom_data() # Re-extract to update PRG/CHR views! Yay, changes everywhere!
+                self.data[abs_address] = new_byte # The actual byte modification! PRG/CHR views see it right away, woohoo!
+                self._mark_dirty(abs_address, abs_address + 1)
+                self._version += 1 # Old dumps are history now!
                 return f"Byte at {rom_type} address {address_in_rom:04X} (abs: {abs_address:08X}) changed to {new_value.upper()}! FUCK YEAH, you did it, you magnificent bastard!"
             else:
                 return "Something went FUBAR with the address, dipshit! Double check your input!"
@@ -125,24 +265,87 @@ class NESRom:
         except Exception as e:
             return f"An unexpected clusterfuck happened: {e}"
 
+    def _mark_dirty(self, start, end):
+        # Flag every page touched by self.data[start:end] so the next save rewrites it!
+        first, last = start // DIRTY_PAGE_SIZE, (end - 1) // DIRTY_PAGE_SIZE
+        self._dirty_pages[first:last + 1] = b"\x01" * (last - first + 1)
+
+    def _is_clean_copy(self, path):
+        # Is the file at path byte-for-byte us, apart from the dirty pages? Then we can patch it instead of rewriting it!
+        return (self._clean_path is not None and os.path.exists(path) and os.path.exists(self._clean_path)
+                and os.path.samefile(path, self._clean_path) and os.path.getsize(path) == len(self.data))
+
     def save_rom(self, new_filepath):
         # We're saving our super awesome modified ROM! This is making history, one byte at a time!
-        with open(new_filepath, "wb") as f:
-            f.write(self.data)
-        self.filepath = new_filepath # Update the path! Meow! Your masterpiece is saved!
+        if self._is_clean_copy(new_filepath):
+            # Same file we loaded/saved last time: seek and write ONLY the dirty pages, O(edits) not O(ROM)!
+            # No truncation, so even the file under our copy-on-write mapping is safe to patch in place.
+            dirty = self._dirty_pages
+            with open(new_filepath, "r+b") as f:
+                page = dirty.find(1)
+                while page >= 0:
+                    start = page * DIRTY_PAGE_SIZE
+                    f.seek(start)
+                    f.write(self.data[start:start + DIRTY_PAGE_SIZE])
+                    page = dirty.find(1, page + 1)
+        elif self._mm is not None and os.path.exists(new_filepath) and os.path.samefile(new_filepath, self._source_path):
+            # Overwriting the file we're mapped onto! Windows won't let anyone truncate or replace a mapped file,
+            # so pull the ROM into RAM, drop the mapping, THEN rewrite it in place. Same inode, same permissions!
+            self._detach_mapping()
+            with open(new_filepath, "r+b") as f:
+                f.write(self.data)
+                f.truncate()
+        else:
+            with open(new_filepath, "wb") as f:
+                f.write(self.data)
+        # Whatever path we just wrote now matches us exactly. Clean slate!
+        self._dirty_pages[:] = bytes(len(self._dirty_pages))
+        self._clean_path = new_filepath
+        self._set_filepath(new_filepath) # Update the path! Meow! Your masterpiece is saved!
         return "ROM saved successfully! FUCKING BADASS! You've officially mangled it like a pro!"
 
+    def _detach_mapping(self):
+        # Copy the ROM out of the mapping into a plain bytearray and let the file go. Contents don't change, only where they live!
+        mm, self._mm = self._mm, None
+        self.data = bytearray(self.data)
+        self.header = self.data[:16]
+        if self.valid:
+            self.extract_rom_data() # Re-point the PRG/CHR views at the new buffer, the old ones die with the mapping
+        try:
+            mm.close()
+        except BufferError: # Some straggler view still pins it - it gets unmapped when that view goes away
+            pass
+
+    def close(self):
+        # We're done with this ROM for good: drop every view into the mapping and unmap the file RIGHT NOW.
+        # Waiting on the garbage collector keeps it mapped (and locked on Windows) for who knows how long!
+        self._opcodes_cached.cache_clear()
+        mm, self._mm = self._mm, None
+        if mm is None:
+            return
+        for name in ("prg_rom", "chr_rom", "header", "data"): # Slices first, the view they came from last
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        try:
+            mm.close()
+        except BufferError: # Some straggler view still pins it - it gets unmapped when that view goes away
+            pass
+
     def find_bytes_in_section(self, data_section, section_offset, search_bytes_hex):
         found_locations = []
         try:
-            search_sequence = bytes.fromhex(search_bytes_hex)
+            search_sequence = _compile_needle(search_bytes_hex)
             if not search_sequence: return [] # Nothing to search for, idiot
 
-            for i in range(len(data_section) - len(search_sequence) + 1):
-                if data_section[i:i+len(search_sequence)] == search_sequence:
-                    relative_addr = i
-                    absolute_addr = section_offset + i
-                    found_locations.append((relative_addr, absolute_addr))
+            if self._mm is not None and isinstance(data_section, memoryview) and data_section.obj is self._mm:
+                # A section view of our mapping: let mmap.find() sniff it right where it lives, zero copies!
+                hits = _find_all(self._mm, search_sequence, section_offset, section_offset + len(data_section))
+                found_locations = [(i - section_offset, i) for i in hits] # (relative addr, absolute addr)
+            else:
+                # memoryviews can't .find(), so anything else gets one bytes snapshot
+                haystack = data_section if isinstance(data_section, (bytes, bytearray)) else bytes(data_section)
+                found_locations = [(i, section_offset + i) for i in _find_all(haystack, search_sequence, 0, len(haystack))]
             return found_locations
         except ValueError:
             raise ValueError("Invalid hex string for search. Use proper hex, dumbfuck.")
@@ -152,69 +355,78 @@ class NESRom:
 
     def damnation_engine_unleash(self, rom_type, mode, intensity_percent, xor_key_hex=None):
         # LET THE GODDAMN CHAOS BEGIN! YOU WANTED BLOODLUST, YOU GET BLOODLUST!
+        # Returns (message, sorted section indices we mangled) so the UI can repaint just the wounded rows!
         target_data_array = None
-        data_offset = 0
 
         if rom_type == "PRG":
             if not hasattr(self, "prg_rom") or not self.prg_rom:
-                return "No PRG ROM to fucking mutilate! Load something first, dicknozzle!"
-            # Operate on a copy for modification, then write back to self.data
-            target_data_array = self.prg_rom[:] # Make a mutable copy
-            data_offset = self.prg_rom_offset
+                return "No PRG ROM to fucking mutilate! Load something first, dicknozzle!", []
+            # The PRG view aliases self.data, so we mutilate the real thing in place! One pass, no copies!
+            target_data_array = self.prg_rom
+            region_offset = self.prg_rom_offset
         elif rom_type == "CHR":
             if not hasattr(self, "chr_rom") or not self.chr_rom:
-                return "No CHR ROM to defile, you sick fuck! Get some graphics data in here!"
-            target_data_array = self.chr_rom[:] # Make a mutable copy
-            data_offset = self.chr_rom_offset
+                return "No CHR ROM to defile, you sick fuck! Get some graphics data in here!", []
+            target_data_array = self.chr_rom # Same deal, straight into self.data!
+            region_offset = self.chr_rom_offset
         else:
-            return "What the FUCK are you trying to mutilate? PRG or CHR, pick one, asshole!"
+            return "What the FUCK are you trying to mutilate? PRG or CHR, pick one, asshole!", []
 
         if not target_data_array:
-             return "No data to fuck up. You're a disappointment."
+             return "No data to fuck up. You're a disappointment.", []
 
         num_bytes_to_affect = int(len(target_data_array) * (intensity_percent / 100.0))
         if num_bytes_to_affect == 0:
-            return "Zero intensity? Are you fucking kidding me? Go big or go home, pussy!"
+            return "Zero intensity? Are you fucking kidding me? Go big or go home, pussy!", []
 
-        indices_to_affect = random.sample(range(len(target_data_array)), k=min(num_bytes_to_affect, len(target_data_array)))
-        
+        # Parse the XOR key ONCE, up front, before we waste a single cycle picking victims for a garbage key!
+        key = None
+        if mode == "XOR Mayhem":
+            if xor_key_hex is None: return "XOR Mayhem needs a goddamn XOR key, genius!", []
+            try:
+                key = int(xor_key_hex, 16)
+                if not (0 <= key <= 255): raise ValueError()
+            except ValueError:
+                return "Invalid XOR key. Must be a single hex byte (00-FF), you fucking amateur.", []
+
+        indices_to_affect = _sample_indices(self._rng, len(target_data_array), min(num_bytes_to_affect, len(target_data_array)))
+
+        # Every mode is one fused kernel pass over the whole batch of victims. No per-byte Python loop!
+        kernel = DAMNATION_KERNELS.get(mode)
         modified_count = 0
-        for index in indices_to_affect:
-            original_byte = target_data_array[index]
-            if mode == "XOR Mayhem":
-                if xor_key_hex is None: return "XOR Mayhem needs a goddamn XOR key, genius!"
-                try:
-                    key = int(xor_key_hex, 16)
-                    if not (0 <= key <= 255): raise ValueError()
-                    target_data_array[index] = original_byte ^ key
-                    modified_count +=1
-                except ValueError:
-                    return "Invalid XOR key. Must be a single hex byte (00-FF), you fucking amateur."
-            elif mode == "Random Garbage Fill":
-                target_data_array[index] = random.randint(0, 255)
-                modified_count +=1
-            elif mode == "Byte Shift Storm":
-                shift = random.randint(-15, 15) # More chaotic shift
-                target_data_array[index] = (original_byte + shift) % 256
-                modified_count +=1
-            # Add more fucked up modes here later, this is just the beginning!
-        
-        # Write the mutilated data back into the main self.data bytearray
-        for i, byte_val in enumerate(target_data_array):
-            self.data[data_offset + i] = byte_val
-        
-        self.extract_rom_data() # Re-extract to make sure PRG/CHR views are updated with the carnage!
+        mutated = []
+        if kernel is not None:
+            kernel(target_data_array, indices_to_affect, key, self._rng)
+            modified_count = len(indices_to_affect)
+            mutated = sorted(indices_to_affect)
+            self._mark_dirty(region_offset, region_offset + len(target_data_array)) # The whole section's a crime scene now
+            self._version += 1 # Everything we cached is a lie now, toss it!
+        # The kernel wrote through the view, so self.data already shows the carnage! No write-back, no re-extract!
 
-        return f"DAMNATION ENGINE HAS WROUGHT HAVOC! {modified_count} bytes in {rom_type} mercilessly MUTILATED with {mode}! FEEL THE POWER, YOU SICK BASTARD! HAHAHA!"
+        return f"DAMNATION ENGINE HAS WROUGHT HAVOC! {modified_count} bytes in {rom_type} mercilessly MUTILATED with {mode}! FEEL THE POWER, YOU SICK BASTARD! HAHAHA!", mutated
 
 
 class VoidRipperApp(tk.Tk):
+    # What the text areas say while there's no ROM to brutalize
+    NO_ROM_INFO_TEXT = "No ROM loaded, dickhead. Feed me some data!"
+    NO_ROM_OPCODE_TEXT = "Load a goddamn ROM to see its guts, you voyeur!"
+    NO_ROM_HEX_TEXT = "Hex editor is hungry for bytes! Load a fucking ROM!"
+    NO_ROM_SEARCH_TEXT = "Can't sniff shit without a ROM, Sherlock. Load one up!"
+
     def __init__(self):
         super().__init__()
         self.title("🔥 VoidRipper NES Mutilator 🔥 - Unleash Digital Hell!")
         self.geometry("800x700") # Bigger for more fucking mayhem!
         self.configure(bg=BG_COLOR) # Dark as my soul!
         self.current_rom = None # Our little ROM victim, waiting to be tortured!
+        # Every widget that flips with "is a ROM loaded?", collected as the tabs get built. No tree-walking later!
+        self._state_dependent_widgets = [] # NORMAL <-> DISABLED
+        self._readonly_widgets = [] # Comboboxes: "readonly" <-> DISABLED
+        self._hex_render_job = None # Pending after_idle job that fills in the rows scrolled into view
+        self._hex_rows = 0 # Row count of the dump in the hex view (0: nothing to fill in lazily)
+        self._hex_rendered = set() # Rows already formatted into the hex view, the rest are blank lines
+        self._last_is_rom_loaded = None # What update_ui_state last set everything up for
+        self._hex_refresh_after_id = None # Pending debounced hex refresh
 
         # --- Global Font Styles ---
         self.font_normal = (FONT_FAMILY, FONT_SIZE_NORMAL)
@@ -233,6 +445,15 @@ class VoidRipperApp(tk.Tk):
         self.create_damnation_engine_tab() # OH FUCK YEAH, THE MAIN EVENT!
         self.create_ripper_tab()
 
+        # Tabs that show ROM-derived text only redraw when they're actually looked at, and only if the ROM changed since!
+        self._tab_refreshers = {
+            str(self.info_frame): self.update_info_on_load,
+            str(self.hex_frame): self.refresh_hex_view,
+        }
+        self._tab_shown = {} # tab -> (id(rom), _version) it was last drawn from. Never the ROM itself, or its file stays mapped!
+        self._hex_view = None # (rom_type, offset, length) currently on screen in the hex editor
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
         # --- Bottom Buttons ---
         button_frame = tk.Frame(self, bg=BG_COLOR)
         button_frame.pack(pady=10, fill="x", padx=10)
@@ -261,14 +482,19 @@ class VoidRipperApp(tk.Tk):
         return tk.Label(parent, text=text, font=font_style, bg=BG_COLOR, fg=fg)
 
     def _create_styled_button(self, parent, text, command, bg=BTN_BG_COLOR, fg=BTN_FG_COLOR):
-        return tk.Button(parent, text=text, font=self.font_bold, command=command, bg=bg, fg=fg, relief=tk.RAISED, borderwidth=2, padx=5, pady=2)
+        button = tk.Button(parent, text=text, font=self.font_bold, command=command, bg=bg, fg=fg, relief=tk.RAISED, borderwidth=2, padx=5, pady=2)
+        self._state_dependent_widgets.append(button)
+        return button
 
     def _create_styled_entry(self, parent, width=10):
-        return tk.Entry(parent, width=width, font=self.font_normal, bg=ENTRY_BG_COLOR, fg=ENTRY_FG_COLOR, insertbackground=FG_COLOR, relief=tk.SUNKEN, borderwidth=2)
+        entry = tk.Entry(parent, width=width, font=self.font_normal, bg=ENTRY_BG_COLOR, fg=ENTRY_FG_COLOR, insertbackground=FG_COLOR, relief=tk.SUNKEN, borderwidth=2)
+        self._state_dependent_widgets.append(entry)
+        return entry
 
     def _create_styled_scrolledtext(self, parent, width, height, state="disabled"):
         st = scrolledtext.ScrolledText(parent, width=width, height=height, font=self.font_normal, bg=ENTRY_BG_COLOR, fg=ENTRY_FG_COLOR, insertbackground=FG_COLOR, relief=tk.SUNKEN, borderwidth=2, state=state)
         st.tag_configure("error", foreground=ALT_FG_COLOR)
+        self._state_dependent_widgets.append(st)
         return st
 
     def _create_styled_combobox(self, parent, values, default_value, readonly=True):
@@ -276,6 +502,7 @@ class VoidRipperApp(tk.Tk):
         # For now, basic ttk combobox
         combo = ttk.Combobox(parent, values=values, state="readonly" if readonly else "normal", width=10, font=self.font_normal)
         combo.set(default_value)
+        self._readonly_widgets.append(combo)
         # For darker theme, we might need to style the ttk.Combobox popdown list too
         # This requires more advanced ttk styling which can be platform dependent.
         # A simple `combo.config(background=ENTRY_BG_COLOR, foreground=ENTRY_FG_COLOR)` doesn't work well for ttk.
@@ -309,17 +536,19 @@ class VoidRipperApp(tk.Tk):
         self._create_styled_label(controls_frame, "ROM Section:").grid(row=0, column=0, padx=5, pady=2, sticky="w")
         self.hex_rom_type_combo = self._create_styled_combobox(controls_frame, ["PRG", "CHR"], "PRG")
         self.hex_rom_type_combo.grid(row=0, column=1, padx=5, pady=2, sticky="ew")
-        self.hex_rom_type_combo.bind("<<ComboboxSelected>>", self.refresh_hex_view)
+        self.hex_rom_type_combo.bind("<<ComboboxSelected>>", self._schedule_hex_refresh)
 
         self._create_styled_label(controls_frame, "Offset (hex):").grid(row=1, column=0, padx=5, pady=2, sticky="w")
         self.hex_offset_entry = self._create_styled_entry(controls_frame, width=12)
         self.hex_offset_entry.grid(row=1, column=1, padx=5, pady=2, sticky="ew")
         self.hex_offset_entry.insert(0, "0000")
+        self.hex_offset_entry.bind("<KeyRelease>", self._schedule_hex_refresh)
 
         self._create_styled_label(controls_frame, "Length (dec):").grid(row=1, column=2, padx=5, pady=2, sticky="w")
         self.hex_length_entry = self._create_styled_entry(controls_frame, width=8)
         self.hex_length_entry.grid(row=1, column=3, padx=5, pady=2, sticky="ew")
         self.hex_length_entry.insert(0, "256")
+        self.hex_length_entry.bind("<KeyRelease>", self._schedule_hex_refresh)
         
         self._create_styled_button(controls_frame, "Refresh View", self.refresh_hex_view, bg="#003366", fg="#66CCFF").grid(row=1, column=4, padx=10, pady=2)
         
@@ -327,6 +556,10 @@ class VoidRipperApp(tk.Tk):
         controls_frame.grid_columnconfigure(3, weight=1)
 
         self.hex_display = self._create_styled_scrolledtext(self.hex_frame, width=90, height=15)
+        self.hex_display.config(wrap="none") # Rows are fixed-width, so Tk never has to work out line wrapping on inserts!
+        # Any scroll, wheel spin or resize moves the view - fill in whatever rows just came into sight
+        self.hex_display.config(yscrollcommand=self._on_hex_yscroll)
+        self.hex_display.bind("<Configure>", self._schedule_hex_render)
         self.hex_display.pack(pady=10, fill="both", expand=True)
 
         # Edit Frame
@@ -397,10 +630,12 @@ class VoidRipperApp(tk.Tk):
         self._create_styled_label(controls_frame, "Intensity (% of bytes):").grid(row=3, column=0, padx=5, pady=5, sticky="e")
         self.damnation_intensity_scale = Scale(controls_frame, from_=1, to=100, orient=tk.HORIZONTAL, length=200, bg=BG_COLOR, fg=FG_COLOR, troughcolor=ENTRY_BG_COLOR, highlightbackground=BG_COLOR, font=self.font_normal)
         self.damnation_intensity_scale.set(10) # Default 10%
+        self._state_dependent_widgets.append(self.damnation_intensity_scale)
         self.damnation_intensity_scale.grid(row=3, column=1, padx=5, pady=5, sticky="w")
 
         unleash_button = tk.Button(self.damnation_frame, text="💥 UNLEASH MUTATION! 💥", font=(FONT_FAMILY, 14, "bold"), command=self.unleash_damnation_action, bg="#990000", fg="#FFFFFF", relief=tk.RAISED, borderwidth=3, padx=20, pady=10)
         unleash_button.pack(pady=30)
+        self._state_dependent_widgets.append(unleash_button)
 
         self.damnation_status_label = self._create_styled_label(self.damnation_frame, "The engine slumbers... awaken it with a ROM!", font_style=self.font_normal, fg=ALT_FG_COLOR)
         self.damnation_status_label.pack(pady=10)
@@ -447,12 +682,14 @@ class VoidRipperApp(tk.Tk):
             self.damnation_status_label.config(text=f"Unleashing {mode} on {target_section}... Stand back, this might get messy!")
             self.update() # Force UI update
             
-            result = self.current_rom.damnation_engine_unleash(target_section, mode, intensity, xor_key)
+            rom = self.current_rom
+            before = (id(rom), rom._version)
+            result, mutated = rom.damnation_engine_unleash(target_section, mode, intensity, xor_key)
             
             messagebox.showinfo("DAMNATION COMPLETE!", result, icon="info")
             self.damnation_status_label.config(text=result)
-            self.refresh_hex_view() # Show the beautiful carnage!
-            self.update_info_on_load() # Update opcodes if PRG was hit
+            self._patch_damnation_views(target_section, mutated, before) # Repaint just the rows that got hit!
+            self._on_tab_changed() # Anything the patch couldn't fix catches up when you flip to it!
             self.status_bar_text.set("ROM successfully mutilated! Save your masterpiece of destruction!")
 
         except Exception as e:
@@ -480,110 +717,104 @@ class VoidRipperApp(tk.Tk):
 
         self._create_styled_label(self.ripper_frame, "Remember, possession is 9/10ths of the law. The other 1/10th is running fast. GO GET 'EM!", font_style=self.font_bold, fg="#66FF66").pack(pady=20)
 
+    def _set_readonly_text(self, widget, text):
+        # Swap a read-only text area's whole contents in ONE replace call instead of delete + insert!
+        widget.config(state="normal")
+        widget.replace("1.0", tk.END, text)
+        widget.config(state="disabled")
+
     def update_ui_state(self, is_rom_loaded=None):
         if is_rom_loaded is None:
             is_rom_loaded = self.current_rom is not None and self.current_rom.valid
         
+        if is_rom_loaded == self._last_is_rom_loaded:
+            return # Nothing flipped, so every widget and placeholder is already right! Skip the churn!
+        self._last_is_rom_loaded = is_rom_loaded
+
         state = tk.NORMAL if is_rom_loaded else tk.DISABLED
 
-        # Iterate through all child widgets of the notebook tabs and configure them
-        for tab_name in self.notebook.tabs():
-            tab_widget = self.notebook.nametowidget(tab_name)
-            for child in tab_widget.winfo_children():
-                self._configure_widget_state_recursively(child, state)
+        # Just the widgets we registered while building the tabs, one config each! No walking the whole widget tree!
+        for widget in self._state_dependent_widgets:
+            widget.config(state=state)
+        combo_state = "readonly" if is_rom_loaded else tk.DISABLED # For ttk.Combobox, "readonly" is active, "disabled" is off.
+        for widget in self._readonly_widgets:
+            widget.config(state=combo_state)
         
         # Special handling for widgets outside notebook or always enabled
         if hasattr(self, 'open_button'): self.open_button.config(state=tk.NORMAL) # Always enabled
         if hasattr(self, 'save_button'): self.save_button.config(state=state)
         
-        # Update Hex Editor specific controls
-        if hasattr(self, 'hex_rom_type_combo'): self.hex_rom_type_combo.config(state="readonly" if is_rom_loaded else tk.DISABLED)
-        if hasattr(self, 'hex_offset_entry'): self.hex_offset_entry.config(state=state)
-        if hasattr(self, 'hex_length_entry'): self.hex_length_entry.config(state=state)
-        if hasattr(self, 'edit_address_entry'): self.edit_address_entry.config(state=state)
-        if hasattr(self, 'edit_value_entry'): self.edit_value_entry.config(state=state)
-        # Update Byte Sniffer specific controls
-        if hasattr(self, 'search_bytes_entry'): self.search_bytes_entry.config(state=state)
-        # Update Damnation Engine specific controls
-        if hasattr(self, 'damnation_target_combo'): self.damnation_target_combo.config(state="readonly" if is_rom_loaded else tk.DISABLED)
-        if hasattr(self, 'damnation_mode_combo'): self.damnation_mode_combo.config(state="readonly" if is_rom_loaded else tk.DISABLED)
+        # The XOR key only makes sense in XOR Mayhem mode
         if hasattr(self, 'damnation_xor_key_entry'): self.damnation_xor_key_entry.config(state=state if self.damnation_mode_combo.get() == "XOR Mayhem" and is_rom_loaded else tk.DISABLED)
-        if hasattr(self, 'damnation_intensity_scale'): self.damnation_intensity_scale.config(state=state)
         
         # Update text areas if no ROM is loaded
         if not is_rom_loaded:
-            if hasattr(self, 'info_text_area'):
-                self.info_text_area.config(state="normal")
-                self.info_text_area.delete(1.0, tk.END)
-                self.info_text_area.insert(tk.END, "No ROM loaded, dickhead. Feed me some data!")
-                self.info_text_area.config(state="disabled")
-            if hasattr(self, 'opcode_area'):
-                self.opcode_area.config(state="normal")
-                self.opcode_area.delete(1.0, tk.END)
-                self.opcode_area.insert(tk.END, "Load a goddamn ROM to see its guts, you voyeur!")
-                self.opcode_area.config(state="disabled")
+            if hasattr(self, 'info_text_area'): self._set_readonly_text(self.info_text_area, self.NO_ROM_INFO_TEXT)
+            if hasattr(self, 'opcode_area'): self._set_readonly_text(self.opcode_area, self.NO_ROM_OPCODE_TEXT)
             if hasattr(self, 'hex_display'):
-                self.hex_display.config(state="normal")
-                self.hex_display.delete(1.0, tk.END)
-                self.hex_display.insert(tk.END, "Hex editor is hungry for bytes! Load a fucking ROM!")
-                self.hex_display.config(state="disabled")
-            if hasattr(self, 'search_results_text'):
-                self.search_results_text.config(state="normal")
-                self.search_results_text.delete(1.0, tk.END)
-                self.search_results_text.insert(tk.END, "Can't sniff shit without a ROM, Sherlock. Load one up!")
-                self.search_results_text.config(state="disabled")
+                self._cancel_hex_render() # Don't let leftover rows land on top of the message!
+                self._set_readonly_text(self.hex_display, self.NO_ROM_HEX_TEXT)
+            if hasattr(self, 'search_results_text'): self._set_readonly_text(self.search_results_text, self.NO_ROM_SEARCH_TEXT)
             if hasattr(self, 'damnation_status_label'):
                 self.damnation_status_label.config(text="The Damnation Engine sleeps... Load a ROM to awaken its destructive fury!")
             self.status_bar_text.set("Load a ROM to begin the fucking slaughter! HQRIPPER 7.1 ready for asset theft!")
 
 
-    def _configure_widget_state_recursively(self, widget, state):
-        # Exclude labels from being disabled unless they are part of a specific control group
-        # that should be disabled. For simplicity, just disable common interactive widgets.
-        if isinstance(widget, (tk.Button, tk.Entry, scrolledtext.ScrolledText, ttk.Combobox, Scale)):
-            if widget != self.open_button : # Don't disable the open button
-                 try: widget.config(state=state)
-                 except tk.TclError: pass # Some widgets might not support state or already be fine
-        
-        # For ttk.Combobox, "readonly" is active, "disabled" is off.
-        if isinstance(widget, ttk.Combobox):
-            widget.config(state="readonly" if state == tk.NORMAL else tk.DISABLED)
-
-        for child in widget.winfo_children():
-            self._configure_widget_state_recursively(child, state)
-
-
     def load_rom(self):
         file_path = filedialog.askopenfilename(title="Select NES ROM to Violate!", filetypes=[("NES ROMs", "*.nes"), ("All files", "*.*")])
         if not file_path:
             self.status_bar_text.set("No ROM selected, you coward. Try again!")
             return
 
+        rom = None
         try:
             rom = NESRom(file_path)
             if not rom.valid:
                 raise ValueError("This ain't no NES ROM, you blind fuck! (Header's fucked or missing)")
 
+            self._drop_rom() # Let go of the last victim's file before the new one moves in!
             self.current_rom = rom
-            self.update_info_on_load()
-            self.refresh_hex_view() 
             self.update_ui_state(is_rom_loaded=True)
-            self.status_bar_text.set(f"ROM LOADED: {file_path.split('/')[-1]}. LET THE MUTILATION BEGIN!")
+            self._on_tab_changed() # Only the tab you're staring at gets drawn now, the rest wait their turn!
+            self.status_bar_text.set(f"ROM LOADED: {rom.basename}. LET THE MUTILATION BEGIN!")
             if hasattr(self, 'damnation_status_label'): self.damnation_status_label.config(text="ROM loaded! The Damnation Engine is HUNGRY!")
 
         except Exception as e:
+            if rom is not None and rom is not self.current_rom:
+                rom.close() # Never made it in, don't leave its file mapped
             messagebox.showerror("ROM LOAD FUCKUP", f"Mothafucka! Error loading ROM:\n{e}. Don't worry, just try again, dumbass!", icon="error")
-            self.current_rom = None
+            self._drop_rom()
             self.update_ui_state(is_rom_loaded=False)
             self.status_bar_text.set("ROM loading failed. You suck. Try another one.")
 
+    def _drop_rom(self):
+        # Unmap the current ROM's file and forget every tab drawn from it
+        if self.current_rom is not None:
+            self.current_rom.close()
+        self.current_rom = None
+        self._tab_shown.clear()
+
+    def _on_tab_changed(self, event=None):
+        # Redraw the visible tab only if it was last drawn from a different ROM or an older _version. Flipping back and forth is free!
+        rom = self.current_rom
+        if not rom or not rom.valid:
+            return
+        tab = self.notebook.select()
+        refresh = self._tab_refreshers.get(tab)
+        if refresh is None:
+            return
+        key = (id(rom), rom._version)
+        if self._tab_shown.get(tab) != key:
+            self._tab_shown[tab] = key # Set first, so a refresher that chokes can take it back
+            refresh()
+
     def update_info_on_load(self):
         if not self.current_rom or not self.current_rom.valid:
             return
         
         rom = self.current_rom
         info = (
-            f"File: {rom.filepath.split('/')[-1]}\n"
+            f"File: {rom.basename}\n"
             f"PRG ROM Size: {rom.prg_rom_size // 1024} KB ({rom.prg_rom_size} bytes) - That's a lot of code to fuck up!\n"
             f"CHR ROM Size: {rom.chr_rom_size // 1024} KB ({rom.chr_rom_size} bytes) - Graphics begging to be defiled!\n"
             f"Mapper: {rom.mapper} - The brains of the operation, let's give it a lobotomy!\n"
@@ -596,7 +827,7 @@ class VoidRipperApp(tk.Tk):
         self.info_text_area.insert(tk.END, info)
         self.info_text_area.config(state="disabled")
 
-        opcodes = rom.get_opcodes(32) # More opcodes, more fun!
+        opcodes = rom.get_opcodes(OPCODE_PREVIEW_BYTES) # More opcodes, more fun!
         self.opcode_area.config(state="normal")
         self.opcode_area.delete(1.0, tk.END)
         if opcodes:
@@ -607,7 +838,17 @@ class VoidRipperApp(tk.Tk):
         self.opcode_area.config(state="disabled")
 
 
-    def refresh_hex_view(self, event=None): 
+    def _schedule_hex_refresh(self, event=None):
+        # A burst of keystrokes/selections collapses into ONE redraw after things calm the fuck down!
+        if self._hex_refresh_after_id is not None:
+            self.after_cancel(self._hex_refresh_after_id)
+        self._hex_refresh_after_id = self.after(HEX_REFRESH_DEBOUNCE_MS, self._debounced_hex_refresh)
+
+    def _debounced_hex_refresh(self):
+        self._hex_refresh_after_id = None
+        self.refresh_hex_view(quiet=True) # Half-typed input isn't worth a popup, the status bar will do
+
+    def refresh_hex_view(self, event=None, quiet=False):
         if not self.current_rom:
             return
 
@@ -622,19 +863,99 @@ class VoidRipperApp(tk.Tk):
             offset = int(offset_str, 16) 
             length = int(length_str)
 
-            dump = self.current_rom.get_hex_dump(offset, length, rom_type)
-            self.hex_display.config(state="normal")
-            self.hex_display.delete(1.0, tk.END)
-            self.hex_display.insert(tk.END, dump)
-            self.hex_display.config(state="disabled")
+            rom = self.current_rom
+            view = (rom_type, offset, length)
+            top = self.hex_display.yview()[0] if view == self._hex_view else 0.0 # Same range? Stay where you were scrolled!
+            span = rom.hex_dump_span(offset, length, rom_type)
+            self._cancel_hex_render() # A fresh refresh beats a half-finished one!
+            self._hex_rendered = set()
+            if span is None:
+                self._hex_rows = 0
+                self._set_readonly_text(self.hex_display, rom.get_hex_dump(offset, length, rom_type)) # Just the error message
+            else:
+                # One blank line per row, so the scrollbar is the right size. Only the rows on screen get formatted!
+                self._hex_rows = span[1]
+                self._set_readonly_text(self.hex_display, "\n" * (span[1] - 1))
+            self._hex_view = view
+            self.hex_display.yview_moveto(top)
+            self._render_visible_hex_rows()
+            self._tab_shown[str(self.hex_frame)] = (id(rom), rom._version)
             self.status_bar_text.set(f"Hex view for {rom_type} refreshed. Go on, stare at its guts.")
         except ValueError as e:
-            messagebox.showerror("HEX EDITOR FUCKUP", f"Oopsie! Input error, shit-for-brains: {e}. Use valid hex for offset and decimal for length, goddamnit!", icon="error")
+            self._tab_shown.pop(str(self.hex_frame), None) # Screen doesn't match the ROM anymore, redraw next time
+            if not quiet:
+                messagebox.showerror("HEX EDITOR FUCKUP", f"Oopsie! Input error, shit-for-brains: {e}. Use valid hex for offset and decimal for length, goddamnit!", icon="error")
             self.status_bar_text.set(f"Hex view input error: {e}")
         except Exception as e:
+            self._tab_shown.pop(str(self.hex_frame), None)
             messagebox.showerror("HEX EDITOR CLUSTERFUCK", f"An unexpected pile of shit occurred while dumping: {e}. We'll probably ignore it!", icon="error")
             self.status_bar_text.set(f"Hex view unexpected error: {e}")
 
+    def _on_hex_yscroll(self, first, last):
+        self.hex_display.vbar.set(first, last)
+        self._schedule_hex_render()
+
+    def _schedule_hex_render(self, event=None):
+        if self._hex_render_job is None and self._hex_rows:
+            self._hex_render_job = self.after_idle(self._render_visible_hex_rows)
+
+    def _render_visible_hex_rows(self):
+        # Format ONLY the rows in (or near) the viewport that are still blank. A 1 MB dump costs the same as 256 bytes!
+        self._hex_render_job = None
+        row_count = self._hex_rows
+        if not row_count or not self.current_rom:
+            return
+        text = self.hex_display
+        top = int(text.index("@0,0").split(".")[0]) - 1 # Text lines start at 1, rows at 0
+        bottom = int(text.index(f"@0,{text.winfo_height()}").split(".")[0])
+        first, last = max(0, top - HEX_VIEW_MARGIN_ROWS), min(row_count, bottom + HEX_VIEW_MARGIN_ROWS)
+        rendered = self._hex_rendered
+        rom_type, offset, length = self._hex_view
+        row = first
+        text.config(state="normal")
+        while row < last:
+            if row in rendered:
+                row += 1
+                continue
+            end = row + 1
+            while end < last and end not in rendered: # Grab the whole blank run, one insert per run
+                end += 1
+            block = self.current_rom.hex_dump_window(offset, length, rom_type, row, end - row)
+            text.delete(f"{row + 1}.0", f"{end}.end")
+            text.insert(f"{row + 1}.0", block[:-1]) # The blank lines already supply the newlines
+            rendered.update(range(row, end))
+            row = end
+        text.config(state="disabled")
+
+    def _patch_damnation_views(self, rom_type, mutated, before):
+        # Views that were up to date right before Damnation only need the mutated bytes fixed, not a full redraw!
+        if not mutated:
+            return
+        rom = self.current_rom
+        after = (id(rom), rom._version)
+        hex_tab, info_tab = str(self.hex_frame), str(self.info_frame)
+        if self._tab_shown.get(hex_tab) == before:
+            shown_type, offset, length = self._hex_view
+            if shown_type == rom_type:
+                # Blank rows will be formatted from the new bytes when they scroll into view, just fix the ones on screen
+                rows = rom.hex_dump_rows(offset, length, rom_type, mutated, only_rows=self._hex_rendered)
+                self.hex_display.config(state="normal")
+                for row, text in rows.items():
+                    line = row + 1 # Text widget lines start at 1
+                    self.hex_display.delete(f"{line}.0", f"{line}.end")
+                    self.hex_display.insert(f"{line}.0", text.rstrip("\n"))
+                self.hex_display.config(state="disabled")
+            self._tab_shown[hex_tab] = after
+        # The info tab only shows the first few PRG bytes - if Damnation missed them, it's still good!
+        if self._tab_shown.get(info_tab) == before and (rom_type != "PRG" or mutated[0] >= OPCODE_PREVIEW_BYTES):
+            self._tab_shown[info_tab] = after
+
+    def _cancel_hex_render(self):
+        if self._hex_render_job is not None:
+            self.after_cancel(self._hex_render_job)
+            self._hex_render_job = None
+        self._hex_rows = 0
+
     def modify_byte_action(self):
         if not self.current_rom:
             messagebox.showwarning("MODIFY BYTE WARNING", "No ROM loaded to fuck with, you absolute buffoon! Load one to begin your reign of terror!", icon="warning")
@@ -655,8 +976,7 @@ class VoidRipperApp(tk.Tk):
             
             if "FUCK YEAH" in result or "error" not in result.lower() and "fuckup" not in result.lower(): # Crude success check
                 messagebox.showinfo("MODIFY BYTE SUCCESS!", result, icon="info")
-                self.refresh_hex_view() # Super important to see our changes! Yay, instant feedback!
-                self.update_info_on_load() # Opcode view might change
+                self._on_tab_changed() # Super important to see our changes! Yay, instant feedback! (Opcodes catch up on the Info tab.)
                 self.status_bar_text.set(f"Byte modified! {result}")
             else:
                 messagebox.showerror("MODIFY BYTE FAILURE", result, icon="error")
@@ -673,8 +993,7 @@ class VoidRipperApp(tk.Tk):
             messagebox.showwarning("SAVE ROM WARNING", "No ROM loaded to save, dipshit! Load one, fuck it up, then save your glorious destruction!", icon="warning")
             return
 
-        original_filename = self.current_rom.filepath.split('/')[-1]
-        base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else original_filename
+        base_name = self.current_rom.stem
 
         save_path = filedialog.asksaveasfilename(
             defaultextension=".nes",
@@ -769,8 +1088,7 @@ class VoidRipperApp(tk.Tk):
             messagebox.showwarning("ASSET THIEF FAIL", f"No {rom_type} data available to rip! Are you blind or just stupid? Load a ROM with some actual fucking data!", icon="warning")
             return
 
-        original_filename = self.current_rom.filepath.split('/')[-1]
-        base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else original_filename
+        base_name = self.current_rom.stem
         
         save_path = filedialog.asksaveasfilename(
             defaultextension=".bin",
@@ -1,8 +1,11 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+import sys
 import struct
+import mmap
 import time
 import threading
+import queue
 
 # --- Constants for "EMUNES" Dark Theme ---
 DARK_BG = "#2B2B2B"
@@ -11,6 +14,10 @@ DARK_FG = "#E0E0E0"
 # NES Screen dimensions
 NES_WIDTH = 256
 NES_HEIGHT = 240
+CYCLES_PER_FRAME = 29780  # NTSC: 1.789773 MHz CPU / 60.1 Hz
+FRAME_TIME = 1 / 60  # emulation pacing target
+FRAME_PUMP_MS = 16  # Tk-thread poll of the frame queue (~60 Hz)
+PGM_HEADER = b"P5\n%d %d\n255\n" % (NES_WIDTH, NES_HEIGHT)  # the frame is grayscale: one byte per pixel
 
 # iNES Header Constants
 INES_HEADER_SIZE = 16
@@ -18,6 +25,9 @@ PRG_PAGE = 16 * 1024
 CHR_PAGE = 8 * 1024
 TRAINER_SIZE = 512
 
+# Key -> controller bit, in report order: A, B, Select, Start, Up, Down, Left, Right
+KEY_BITS = {'z':0, 'x':1, 'Shift_L':2, 'Return':3, 'Up':4, 'Down':5, 'Left':6, 'Right':7}
+
 # -----------------------------------
 #       iNES Header Parser
 # -----------------------------------
@@ -65,7 +75,9 @@ class CPU6502:
         self.pc = 0; self.sp = 0xFD
         self.a = self.x = self.y = 0
         self.status = 0x24; self.cycles = 0
-        self.opcodes = {0xEA: self.op_nop, 0xA9: self.op_lda_imm}
+        # One slot per opcode, NOP for everything not implemented yet
+        self.opcodes = [self.op_nop] * 256
+        self.opcodes[0xEA] = self.op_nop; self.opcodes[0xA9] = self.op_lda_imm
 
     def reset(self):
         lo = self.bus.read(0xFFFC); hi = self.bus.read(0xFFFD)
@@ -76,8 +88,17 @@ class CPU6502:
         return val
 
     def step(self):
-        opcode = self.fetch(); handler = self.opcodes.get(opcode, self.op_nop)
-        handler(); return self.cycles
+        self.opcodes[self.fetch()](); return self.cycles
+
+    def run_cycles(self, budget):
+        # Whole instructions until budget cycles are spent, fetch/dispatch inlined
+        # with everything hot bound to locals; returns the cycles actually used
+        read = self.bus.read; ops = self.opcodes
+        start = self.cycles; end = start + budget
+        while self.cycles < end:
+            pc = self.pc; self.pc = (pc + 1) & 0xFFFF
+            ops[read(pc)]()
+        return self.cycles - start
 
     def op_nop(self): self.cycles += 2
     def op_lda_imm(self): value = self.fetch(); self.a = value; self.cycles += 2
@@ -88,20 +109,20 @@ class CPU6502:
 class PPU2C02:
     def __init__(self, chr_data):
         self.chr = chr_data
-        self.frame = [[0]*NES_WIDTH for _ in range(NES_HEIGHT)]
+        self.frame = bytearray(NES_WIDTH * NES_HEIGHT)  # flat 8-bit shades, pixel (x, y) at y*NES_WIDTH + x
+        self._tiled = False  # frame already holds the tiled pattern
 
     def reset(self): pass
     def tick(self, cpu_cycles): pass
 
     def render(self):
-        tile = self.chr[0:16]
-        for ty in range(NES_HEIGHT//8):
-            for tx in range(NES_WIDTH//8):
-                for y in range(8):
-                    for x in range(8):
-                        bit0 = (tile[y] >> (7-x)) & 1
-                        shade = 255 if bit0 else 0
-                        self.frame[ty*8+y][tx*8+x] = shade
+        if not self._tiled:
+            # Every tile is CHR tile 0 and CHR never changes: decode its 8 rows once,
+            # repeat each across the screen, and keep the result for later frames
+            tile = self.chr[0:16]
+            lines = [bytes(255 if (tile[y] >> (7-x)) & 1 else 0 for x in range(8)) * (NES_WIDTH//8) for y in range(8)]
+            self.frame[:] = b"".join(lines[y & 7] for y in range(NES_HEIGHT))
+            self._tiled = True
         return self.frame
 
 # -----------------------------------
@@ -109,24 +130,39 @@ class PPU2C02:
 # -----------------------------------
 class Bus:
     def __init__(self, prg_data, chr_data):
-        self.prg = bytearray(prg_data); self.chr = bytearray(chr_data)
-        self.ram = [0]*0x800; self.ppu = None
-        self.controller = {k:False for k in ['A','B','Start','Select','Up','Down','Left','Right']}
-        self.strobe = False; self.shift_reg = []
+        self.prg = bytes(prg_data); self.chr = bytearray(chr_data)  # PRG is read-only: no copy when already bytes
+        self.ram = bytearray(0x800); self.ppu = None  # contiguous bytes, not 2048 boxed ints
+        self.buttons_state = 0  # one bit per button, see KEY_BITS
+        self.strobe = False; self.shift_reg = 0  # pending button bits, next one in bit 0
+        # One handler per 4 KB page, indexed by addr >> 12: RAM, PPU regs, APU/IO, expansion/SRAM, PRG
+        self.read_tbl = [self.read_ram]*2 + [self.read_open]*2 + [self.read_io] + [self.read_open]*3 + [self.read_prg]*8
+        self.write_tbl = [self.write_ram]*2 + [self.write_open]*2 + [self.write_io] + [self.write_open]*11
 
     def connect_ppu(self, ppu): self.ppu = ppu
 
-    def read(self, addr):
-        if addr < 0x2000: return self.ram[addr & 0x7FF]
-        if addr == 0x4016:
-            if self.strobe: self.shift_reg = list(self.controller.values())
-            return int(self.shift_reg.pop(0)) if self.shift_reg else 0
-        if 0x8000 <= addr <= 0xFFFF: return self.prg[(addr-0x8000) % len(self.prg)]
-        return 0
+    def latch_pad(self): self.shift_reg = self.buttons_state
+
+    def read(self, addr): return self.read_tbl[addr >> 12](addr)
+    def write(self, addr, val): self.write_tbl[addr >> 12](addr, val)
+
+    def read_ram(self, addr): return self.ram[addr & 0x7FF]
+    def read_prg(self, addr): return self.prg[(addr-0x8000) % len(self.prg)]
+    def read_open(self, addr): return 0
+
+    def read_io(self, addr):
+        if addr != 0x4016: return 0
+        if self.strobe: self.latch_pad()
+        bit = self.shift_reg & 1; self.shift_reg >>= 1
+        return bit
 
-    def write(self, addr, val):
-        if addr < 0x2000: self.ram[addr & 0x7FF] = val
-        if addr == 0x4016: self.strobe = bool(val & 1)
+    def write_ram(self, addr, val): self.ram[addr & 0x7FF] = val & 0xFF
+    def write_open(self, addr, val): pass
+
+    def write_io(self, addr, val):
+        if addr != 0x4016: return
+        strobe = bool(val & 1)
+        if self.strobe and not strobe: self.latch_pad()  # falling edge latches the buttons
+        self.strobe = strobe
 
 # -----------------------------------
 #       GUI Front-end with input & direct data load
@@ -143,6 +179,9 @@ class EMUNESApp:
         self.img = tk.PhotoImage(width=NES_WIDTH, height=NES_HEIGHT)
         self.canvas.create_image((0,0), image=self.img, anchor=tk.NW)
         self.running = False
+        # Finished frames go emulator thread -> Tk thread through a one-slot queue; only the newest is kept
+        self.frames = queue.Queue(maxsize=1)
+        root.after(FRAME_PUMP_MS, self.pump_frames)
         root.bind('<KeyPress>', self.on_key); root.bind('<KeyRelease>', self.on_key)
 
         # Directly load from provided byte data
@@ -150,17 +189,24 @@ class EMUNESApp:
             self.load_rom_data(auto_load_data)
 
     def on_key(self, event):
-        mapping = {'z':'A','x':'B','Return':'Start','Shift_L':'Select',
-                   'Up':'Up','Down':'Down','Left':'Left','Right':'Right'}
-        btn = mapping.get(event.keysym)
-        if btn:
-            self.bus.controller[btn] = (event.type == '2')
+        bit = KEY_BITS.get(event.keysym)
+        if bit is None: return
+        if event.type == '2': self.bus.buttons_state |= 1 << bit
+        else: self.bus.buttons_state &= ~(1 << bit)
 
     def load_rom(self):
         fn = filedialog.askopenfilename(filetypes=[("NES ROM","*.nes")])
         if not fn: return
-        data = open(fn, 'rb').read()
-        self.load_rom_data(data)
+        with open(fn, 'rb') as f:
+            try:
+                # Map instead of read(): only the header/PRG/CHR pages we slice get paged in
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                data = f.read()
+        try:
+            self.load_rom_data(data)
+        finally:
+            if isinstance(data, mmap.mmap): data.close()  # the slices are bytes copies
 
     def load_rom_data(self, data: bytes):
         # Parse header and split PRG/CHR
@@ -183,13 +229,43 @@ class EMUNESApp:
         threading.Thread(target=self.loop, daemon=True).start()
 
     def loop(self):
+        overrun = 0  # cycles the last batch ran past its frame; the next frame is that much shorter
+        deadline = time.perf_counter()
         while self.running:
-            cycles = self.cpu.step(); self.ppu.tick(cycles)
-            frame = self.ppu.render()
-            for y in range(NES_HEIGHT):
-                row = '{' + ' '.join(f"#%02x%02x%02x" % (frame[y][x],frame[y][x],frame[y][x]) for x in range(NES_WIDTH)) + '}'
-                self.img.put(row, (0,y))
-            time.sleep(1/60)
+            budget = CYCLES_PER_FRAME - overrun
+            cycles = self.cpu.run_cycles(budget); overrun = cycles - budget
+            self.ppu.tick(cycles)
+            self.post_frame(self.frame_pgm(self.ppu.render()))
+            # Sleep only what's left of this frame's slot, so emulation/render time doesn't stretch the frame
+            deadline += FRAME_TIME
+            delay = deadline - time.perf_counter()
+            if delay > 0: time.sleep(delay)
+            else: deadline = time.perf_counter()  # fell behind: start a fresh slot instead of racing to catch up
+
+    def frame_pgm(self, frame):
+        # Whole frame as one binary PGM, which Tk's PPM reader takes as-is: no RGB expansion
+        return PGM_HEADER + frame
+
+    def post_frame(self, image):
+        # Emulator thread: replace any frame Tk hasn't shown yet, never block
+        try: self.frames.get_nowait()
+        except queue.Empty: pass
+        try: self.frames.put_nowait(image)
+        except queue.Full: pass  # Tk thread raced us; the next frame will land
+
+    def pump_frames(self):
+        # Tk thread: the only place the PhotoImage is touched
+        try: image = self.frames.get_nowait()
+        except queue.Empty: pass
+        else: self.img.configure(data=image, format="PPM")
+        self.root.after(FRAME_PUMP_MS, self.pump_frames)
+
+def set_high_res_timer(enabled):
+    # Windows sleeps in ~15.6 ms ticks by default; ask for 1 ms ticks while we run
+    if sys.platform != "win32": return
+    import ctypes
+    if enabled: ctypes.windll.winmm.timeBeginPeriod(1)
+    else: ctypes.windll.winmm.timeEndPeriod(1)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -197,4 +273,6 @@ if __name__ == "__main__":
     # with open("path/to/game.nes", "rb") as f: data = f.read()
     # app = EMUNESApp(root, auto_load_data=data)
     app = EMUNESApp(root)
-    root.mainloop()
+    set_high_res_timer(True)
+    try: root.mainloop()
+    finally: set_high_res_timer(False)
@@ -23,15 +23,75 @@ DARK_SCROLLBAR_TROUGH = "#3A3A3A"
 DARK_SCROLLBAR_BG = "#6B6B6B"
 DARK_SCROLLBAR_ACTIVE_BG = "#8B8B8B"
 
+# Widget states, bound once for the run/pause toggling paths
+NORMAL = tk.NORMAL
+DISABLED = tk.DISABLED
+
+# Tk-side present tick while running (~60 Hz)
+PRESENT_INTERVAL_MS = 16
+
+# Status-line templates, filled with one %-format per refresh
+_CPU_FMT = "CPU: A=%02X X=%02X Y=%02X SP=%02X PC=%04X P=[%s] CYC:%d"
+_PPU_FMT = "PPU: Scanline=%3d Cycle=%3d V=%04X T=%04X"
+
+# P register rendered as "NV-BDIZC" for every possible status byte (bit 5 is unused and always shown as '-')
+FLAG_STR_LUT = tuple("".join(ch if p & (0x80 >> i) else "-" for i, ch in enumerate("NV-BDIZC")) for p in range(256))
+
 # NES Screen dimensions
 NES_WIDTH = 256
 NES_HEIGHT = 240
+# Binary PPM (P6) header for one full NES frame; Tk's PhotoImage parses it natively
+SCREEN_ZOOM = 2 # on-screen scale of the NES frame
+PPM_HEADER = b"P6\n%d %d\n255\n" % (NES_WIDTH, NES_HEIGHT)
+# All-black frame, built once and reused for every blank/paused paint
+BLANK_PPM = PPM_HEADER + bytes(NES_WIDTH * NES_HEIGHT * 3)
+
+# 2C02 master palette (64 colours)
+NES_PALETTE = [
+    (84, 84, 84), (0, 30, 116), (8, 16, 144), (48, 0, 136), (68, 0, 100), (92, 0, 48), (84, 4, 0), (60, 24, 0),
+    (32, 42, 0), (8, 58, 0), (0, 64, 0), (0, 60, 0), (0, 50, 60), (0, 0, 0), (0, 0, 0), (0, 0, 0),
+    (152, 150, 152), (8, 76, 196), (48, 50, 236), (92, 30, 228), (136, 20, 176), (160, 20, 100), (152, 34, 32), (120, 60, 0),
+    (84, 90, 0), (40, 114, 0), (8, 124, 0), (0, 118, 40), (0, 102, 120), (0, 0, 0), (0, 0, 0), (0, 0, 0),
+    (236, 238, 236), (76, 154, 236), (120, 124, 236), (176, 98, 236), (228, 84, 236), (236, 88, 180), (236, 106, 100), (212, 136, 32),
+    (160, 170, 0), (116, 196, 0), (76, 208, 32), (56, 204, 108), (56, 180, 204), (60, 60, 60), (0, 0, 0), (0, 0, 0),
+    (236, 238, 236), (168, 204, 236), (188, 188, 236), (212, 178, 236), (236, 174, 236), (236, 174, 212), (236, 180, 176), (228, 196, 144),
+    (204, 210, 120), (180, 222, 120), (168, 226, 144), (152, 226, 180), (160, 214, 228), (160, 162, 160), (0, 0, 0), (0, 0, 0),
+]
+
+def palette_tables(palette) -> tuple:
+    """Turns a list of (r, g, b) into per-channel bytes.translate tables; byte values wrap onto the palette."""
+    size = len(palette)
+    return tuple(bytes(palette[i % size][channel] for i in range(256)) for channel in range(3))
+
+# Precomputed once: palette expansion is then one C-level translate per channel, with no masking of indices
+NES_PALETTE_RGB = palette_tables(NES_PALETTE)
 
 # iNES Header Constants
 INES_HEADER_SIZE = 16
 PRG_ROM_PAGE_SIZE = 16 * 1024  # 16KB
 CHR_ROM_PAGE_SIZE = 8 * 1024   # 8KB
 TRAINER_SIZE = 512
+INES_MAGIC = b"NES\x1a"
+# magic, PRG pages, CHR pages, flags 6-10, padding (bytes 11-15)
+_INES_HDR = struct.Struct("<4s7B5s")
+# Flags 6/7 bit-fields decoded once per possible byte value
+# flags 6 -> (mirroring, battery RAM, trainer, four-screen VRAM, mapper low nybble)
+_FLAGS6_FIELDS = tuple((f & 0x01, bool(f & 0x02), bool(f & 0x04), bool(f & 0x08), f >> 4) for f in range(256))
+# flags 7 -> (NES 2.0 identifier, mapper high nybble)
+_FLAGS7_FIELDS = tuple(((f & 0x0C) == 0x08, f & 0xF0) for f in range(256))
+
+# CHR pattern decode table: a plane byte spread over 8 byte-lanes, one bit per lane (bit 7 -> leftmost pixel)
+_PLANE_SPREAD = tuple(int.from_bytes(bytes((b >> (7 - i)) & 1 for i in range(8)), "big") for b in range(256))
+# One CHR tile: 8 bytes of bit-plane 0 followed by 8 bytes of bit-plane 1
+_CHR_TILE = struct.Struct("8s8s")
+
+def decode_chr_tiles(chr_data) -> bytes:
+    """Decodes 16-byte CHR tiles into 64 colour indices each (plane0 | plane1 << 1 per pixel)."""
+    spread = _PLANE_SPREAD
+    whole_tiles = len(chr_data) & ~15 # a truncated dump may end mid-tile
+    return b"".join([(spread[p0] | (spread[p1] << 1)).to_bytes(8, "big")
+                     for plane0, plane1 in _CHR_TILE.iter_unpack(chr_data[:whole_tiles])
+                     for p0, p1 in zip(plane0, plane1)])
 
 class NESRom:
     """Parses and stores information from an iNES ROM file header."""
@@ -80,60 +140,46 @@ class NESRom:
         self.prg_rom_size = self.prg_rom_pages * PRG_ROM_PAGE_SIZE
         self.chr_rom_size = self.chr_rom_pages * CHR_ROM_PAGE_SIZE
 
-        # Extract ROM data sections
+        # Extract ROM data sections as zero-copy views; self.raw_data keeps the backing buffer alive
+        rom_view = memoryview(data)
         current_offset = INES_HEADER_SIZE
         if self.has_trainer:
-            self.trainer_data = data[current_offset : current_offset + TRAINER_SIZE]
+            self.trainer_data = rom_view[current_offset : current_offset + TRAINER_SIZE]
             current_offset += TRAINER_SIZE
         
-        self.prg_rom_data = data[current_offset : current_offset + self.prg_rom_size]
+        self.prg_rom_data = rom_view[current_offset : current_offset + self.prg_rom_size]
         current_offset += self.prg_rom_size
 
-        self.chr_rom_data = data[current_offset : current_offset + self.chr_rom_size]
+        self.chr_rom_data = rom_view[current_offset : current_offset + self.chr_rom_size]
         # Any remaining data is usually ignored or for other formats (e.g., PlayChoice hint screens)
 
     def _parse_header(self):
         """Parses the 16-byte iNES header."""
         try:
-            # Unpack header fields
+            # Unpack header fields in one go
             # Bytes 0-3: Constant $4E $45 $53 $1A ("NES" + EOF)
-            self.magic_nes = self.header_data[0:4].decode('ascii', errors='ignore')
-            if self.magic_nes != "NES\x1a":
-                raise ValueError("Invalid iNES header signature.")
-
             # Byte 4: Size of PRG ROM in 16 KB units
-            self.prg_rom_pages = self.header_data[4]
             # Byte 5: Size of CHR ROM in 8 KB units (0 means CHR RAM)
-            self.chr_rom_pages = self.header_data[5]
-            
-            # Byte 6: Flags 6
-            self.flags6 = self.header_data[6]
-            self.mirroring = self.flags6 & 0x01  # 0 for horizontal, 1 for vertical
-            self.has_battery_ram = bool(self.flags6 & 0x02)
-            self.has_trainer = bool(self.flags6 & 0x04)
-            self.four_screen_vram = bool(self.flags6 & 0x08)
-            mapper_lower_nybble = (self.flags6 & 0xF0) >> 4
-
-            # Byte 7: Flags 7
-            self.flags7 = self.header_data[7]
+            # Bytes 6-10: Flags 6-10 (flags 10 is rarely used consistently for iNES 1.0)
+            # Bytes 11-15: Padding (usually zero)
+            (magic, self.prg_rom_pages, self.chr_rom_pages, self.flags6, self.flags7,
+             self.flags8_prg_ram_size, self.flags9_tv_system, self.flags10_tv_ram,
+             self.padding) = _INES_HDR.unpack_from(self.header_data)
+            if magic != INES_MAGIC:
+                self.magic_nes = magic.decode('ascii', errors='ignore')
+                raise ValueError("Invalid iNES header signature.")
+            self.magic_nes = "NES\x1a"
+
+            # Flags 6: mirroring (0 for horizontal, 1 for vertical), battery, trainer, four-screen, mapper bits 0-3
+            (self.mirroring, self.has_battery_ram, self.has_trainer,
+             self.four_screen_vram, mapper_lower_nybble) = _FLAGS6_FIELDS[self.flags6]
+
+            # Flags 7
             # Bit 0: VS Unisystem (ignored for now)
             # Bit 1: PlayChoice-10 (ignored for now)
             # Bits 2-3: If equal to 2, flags 8-15 are in NES 2.0 format
-            if (self.flags7 & 0x0C) == 0x08: # Check for 0b00001000 (value 8)
-                self.is_nes2 = True
-            mapper_upper_nybble = self.flags7 & 0xF0 # This is also used for NES 2.0 mapper bits 4-7
-
-            # Byte 8: Flags 8
-            self.flags8_prg_ram_size = self.header_data[8] # Can be PRG RAM size or Mapper MSB / Submapper for NES 2.0
-            
-            # Byte 9: Flags 9
-            self.flags9_tv_system = self.header_data[9] # Can be TV system or PRG/CHR RAM size for NES 2.0
-
-            # Byte 10: Flags 10 (rarely used consistently for iNES 1.0)
-            self.flags10_tv_ram = self.header_data[10]
-
-            # Bytes 11-15: Padding (usually zero)
-            self.padding = self.header_data[11:16]
+            # Bits 4-7: mapper bits 4-7 (also used by NES 2.0)
+            self.is_nes2, mapper_upper_nybble = _FLAGS7_FIELDS[self.flags7]
 
             # --- Determine Mapper ---
             if self.is_nes2:
@@ -206,15 +252,26 @@ class NESRom:
 class Cartridge:
     def __init__(self, rom: NESRom):
         self.rom = rom
+        # Every CHR tile pre-decoded to 64 two-bit colour indices (row-major), so the renderer copies rows instead of bit-twiddling
+        self.tile_pixels = decode_chr_tiles(rom.chr_rom_data)
+
+    def tile_row(self, tile: int, row: int) -> bytes:
+        """Returns the 8 colour indices (0-3) of one pattern-table row."""
+        start = (tile << 6) | (row << 3)
+        return self.tile_pixels[start : start + 8]
 
 class CPU6502:
-    # status‑flag constants – not used by the stub implementation but kept for UI formatting
+    # status‑flag constants – index into _FLAG_MASKS for the matching bit of the P register
     FLAG_N = 0; FLAG_V = 1; FLAG_B = 2; FLAG_D = 3; FLAG_I = 4; FLAG_Z = 5; FLAG_C = 6
+    _FLAG_MASKS = (0x80, 0x40, 0x10, 0x08, 0x04, 0x02, 0x01)
+    # fixed register file – slot access skips the per-instance __dict__ on every register touch
+    __slots__ = ("a", "x", "y", "stkp", "pc", "status", "dma_transfer", "dma_addr", "dma_data", "cycles")
 
     def __init__(self):
         self.a = self.x = self.y = 0x00
         self.stkp = 0xFD
         self.pc = 0x8000
+        self.status = 0x00 # P register; the stub never sets any flag
         # DMA helpers so Bus.ppu_write() doesn’t crash when the real CPU is missing
         self.dma_transfer = False
         self.dma_addr = 0
@@ -225,11 +282,19 @@ class CPU6502:
         self.a = self.x = self.y = 0x00
         self.stkp = 0xFD
         self.pc = 0x8000
+        self.status = 0x00
         self.cycles = 0
 
     def get_flag(self, flag: int):
-        # always return False in the stub
-        return False
+        return bool(self.status & self._FLAG_MASKS[flag])
+
+    def run_chunk(self, steps: int) -> int:
+        """Advances the stub CPU by `steps` instructions in one call; returns the cycles consumed."""
+        # The stub "executes" one 3-cycle instruction per step, so the whole chunk folds to arithmetic
+        cycles = 3 * steps
+        self.pc = (self.pc + steps) & 0xFFFF
+        self.cycles += cycles
+        return cycles
 
 class PPU2C02:
     def __init__(self):
@@ -237,14 +302,47 @@ class PPU2C02:
         self.cycle = 0
         self.v = 0
         self.t = 0
-        # 256‑colour fake frame‑buffer (all black)
-        self.screen = [[0 for _ in range(NES_WIDTH)] for _ in range(NES_HEIGHT)]
+        # 256‑colour fake frame‑buffer (all black), flat row-major: pixel (x, y) lives at y*NES_WIDTH + x
+        self.screen = bytearray(NES_WIDTH * NES_HEIGHT)
+        # per-channel translate tables (index -> R, G, B)
+        self.palette_rgb = NES_PALETTE_RGB
+        # preallocated PPM scratch with the header already in place; frames are composed into it in situ
+        self._ppm = bytearray(BLANK_PPM)
         self.oam = bytearray(256)
         self.frame_complete = False
+        self.dirty = False # set when a finished frame hasn't been uploaded to the screen yet
 
     def connect_bus(self, bus):
         self.bus = bus
 
+    def run_frame(self) -> int:
+        """Advances the stub PPU to the end of the current frame; returns the CPU steps that took."""
+        # The stub moves 3 CPU cycles = 9 dots per step, so each scanline is crossed in one jump instead of dot by dot
+        cycle, scanline, steps = self.cycle, self.scanline, 0
+        while True:
+            to_wrap = (341 - cycle + 8) // 9 # steps until the dot counter wraps into the next scanline
+            steps += to_wrap
+            cycle += 9 * to_wrap - 341
+            scanline = (scanline + 1) % 262
+            if scanline == 0: # New frame
+                break
+        self.cycle, self.scanline = cycle, scanline
+        self.frame_complete = True
+        self.dirty = True
+        return steps
+
+    def compose_ppm(self) -> bytes:
+        """Expands the palette-index screen into a finished P6 frame – three C-level translate passes, no per-pixel Python."""
+        red, green, blue = self.palette_rgb
+        screen = self.screen
+        ppm = self._ppm
+        first = len(PPM_HEADER) # pixels start right after the baked-in header
+        # extended-slice stores on the bytearray itself; a memoryview with a step is far slower here
+        ppm[first::3] = screen.translate(red)
+        ppm[first + 1::3] = screen.translate(green)
+        ppm[first + 2::3] = screen.translate(blue)
+        return bytes(ppm) # the only per-frame copy – Tk needs bytes, and the scratch is reused next frame
+
 class Bus:
     """In the real emulator the Bus would arbitrate all reads/writes. For GUI bring‑up we keep it minimal."""
     def __init__(self):
@@ -269,10 +367,13 @@ class Bus:
     #   dummy accessors – avoid crashes when the core isn’t there yet
     # --------------------------------------------------
     def cpu_read(self, addr: int):
+        if addr < 0x2000: # 2 KB work RAM, mirrored up to $1FFF
+            return self.cpu_ram[addr & 0x07FF]
         return 0x00
 
     def cpu_write(self, addr: int, data: int):
-        pass
+        if addr < 0x2000:
+            self.cpu_ram[addr & 0x07FF] = data & 0xFF
 
     def ppu_read(self, addr: int):
         return 0x00
@@ -294,6 +395,31 @@ class Bus:
         """Single system tick. The stub does nothing but keeps the GUI loop alive."""
         pass
 
+class NROMBus(Bus):
+    """Mapper 0 bus: fixed PRG at $8000 (16 KB carts mirrored into $C000) and fixed CHR – no bank registers to consult."""
+    def insert_cartridge(self, cart: Cartridge):
+        super().insert_cartridge(cart)
+        self.prg = cart.rom.prg_rom_data
+        self.chr = cart.rom.chr_rom_data
+        # 16 KB -> 0x3FFF, 32 KB -> 0x7FFF: the mirroring is baked into the mask, reads never branch on the cart
+        self.prg_mask = len(self.prg) - 1
+        self.chr_mask = len(self.chr) - 1
+
+    def cpu_read(self, addr: int):
+        if addr >= 0x8000:
+            return self.prg[addr & self.prg_mask]
+        if addr < 0x2000:
+            return self.cpu_ram[addr & 0x07FF]
+        return 0x00
+
+    def ppu_read(self, addr: int):
+        if addr < 0x2000 and self.chr:
+            return self.chr[addr & self.chr_mask]
+        return 0x00
+
+# Bus specialised per mapper at ROM load; anything unlisted gets the generic stub bus
+MAPPER_BUSES = {0: NROMBus}
+
 # ------------------------------------------------------------
 #                               GUI front‑end
 # ------------------------------------------------------------
@@ -317,14 +443,27 @@ class EMUNESApp:
         self.rom_loaded = False
         self.frame_skip = 0
         self.target_fps = 60
-
-        # image buffer for the NES screen
+        self._screen_blank = False # True while the canvas already shows the black frame
+        self._display_job = None # pending coalesced update_display, if any
+        # emulation runs on a worker thread; finished frames are handed to the Tk thread through _front
+        self._worker = None
+        self._worker_stop = threading.Event()
+        self._worker_error = None
+        self._swap_lock = threading.Lock()
+        self._front = None # newest completed PPM frame not yet presented
+        self._speed_factor = 1.0 # mirrored from the speed slider – the worker must not call into Tk
+        # console lines queued until the next idle flush
+        self._log_buf = []
+        self._log_pending = False
+
+        # image buffer for the NES screen, plus the 2× copy the canvas actually shows
         self.screen_image = tk.PhotoImage(width=NES_WIDTH, height=NES_HEIGHT)
+        self.display_image = tk.PhotoImage(width=NES_WIDTH*SCREEN_ZOOM, height=NES_HEIGHT*SCREEN_ZOOM)
 
         # build all widgets
         self._create_ui()
-        # save explicit reference so Tkinter’s GC keeps the image alive
-        self.screen_canvas.image_ref = self.screen_image
+        # save explicit references so Tkinter’s GC keeps the images alive
+        self.screen_canvas.image_ref = (self.screen_image, self.display_image)
 
         self.log_message("Welcome to EMUNES! Load a ROM to begin…")
 
@@ -345,6 +484,10 @@ class EMUNESApp:
         self.reset_button.pack(side=tk.LEFT, padx=5)
         self.step_button = ttk.Button(top, text="Step", command=self.step, state=tk.DISABLED)
         self.step_button.pack(side=tk.LEFT, padx=5)
+        # bound configure methods – reused on every run/pause/error transition
+        self._run_button_config = self.run_button.configure
+        self._step_button_config = self.step_button.configure
+        self._reset_button_config = self.reset_button.configure
 
         # ttk widgets don’t accept bg/fg options – we switch to classic tk.Labels where we need colours
         self.status_label = tk.Label(top, text="No ROM loaded", bg=DARK_BG, fg=DARK_FG)
@@ -355,11 +498,11 @@ class EMUNESApp:
         main.pack(expand=True, fill=tk.BOTH, padx=10)
 
         # ––––– the 2×‑scaled NES frame –––––
-        self.screen_canvas = tk.Canvas(main, width=NES_WIDTH*2, height=NES_HEIGHT*2,
+        # (canvas.scale only moves an image item's anchor, so the enlargement is done by Tk's photo zoom instead)
+        self.screen_canvas = tk.Canvas(main, width=NES_WIDTH*SCREEN_ZOOM, height=NES_HEIGHT*SCREEN_ZOOM,
                                        bg=DARK_CANVAS_BG, highlightthickness=0)
         self.screen_canvas.pack(side=tk.LEFT)
-        img_id = self.screen_canvas.create_image(0, 0, anchor=tk.NW, image=self.screen_image)
-        self.screen_canvas.scale(img_id, 0, 0, 2, 2)
+        self.screen_canvas.create_image(0, 0, anchor=tk.NW, image=self.display_image)
 
         # ––––– textual console –––––
         console_frame = tk.Frame(main, bg=DARK_BG)
@@ -383,7 +526,8 @@ class EMUNESApp:
         tk.Label(speed_frame, text="Speed:", bg=DARK_BG, fg=DARK_FG).pack(side=tk.LEFT)
         self.speed_scale = tk.Scale(speed_frame, from_=1, to=200, orient=tk.HORIZONTAL,
                                     bg=DARK_BG, fg=DARK_FG, troughcolor=DARK_BORDER, highlightthickness=0,
-                                    sliderrelief=tk.FLAT, activebackground=DARK_ACCENT)
+                                    sliderrelief=tk.FLAT, activebackground=DARK_ACCENT,
+                                    command=self._on_speed_change)
         self.speed_scale.set(100)
         self.speed_scale.pack(side=tk.LEFT, padx=10)
 
@@ -391,8 +535,20 @@ class EMUNESApp:
     #   log helper
     # --------------------------------------------------
     def log_message(self, msg: str):
+        # Queue the line; the console is written once per idle pass instead of once per message
+        self._log_buf.append(msg)
+        if not self._log_pending:
+            self._log_pending = True
+            self.root.after_idle(self._flush_log)
+
+    def _flush_log(self):
+        self._log_pending = False
+        if not self._log_buf:
+            return
+        text = "\n".join(self._log_buf) + "\n"
+        self._log_buf.clear()
         self.console.config(state=tk.NORMAL)
-        self.console.insert(tk.END, msg + "\n")
+        self.console.insert(tk.END, text)
         self.console.see(tk.END)
         self.console.config(state=tk.DISABLED)
 
@@ -414,7 +570,14 @@ class EMUNESApp:
                  return
 
             cart = Cartridge(rom)
-            self.bus.insert_cartridge(cart)
+            # Swap in the bus specialised for this cart's mapper (NROM carts need PRG to index)
+            bus_cls = MAPPER_BUSES.get(rom.mapper, Bus) if rom.prg_rom_data else Bus
+            bus = bus_cls()
+            bus.connect_cpu(self.cpu)
+            bus.connect_ppu(self.ppu)
+            self.ppu.connect_bus(bus)
+            bus.insert_cartridge(cart)
+            self.bus = bus
             self.rom_loaded = True
             self.reset_emulator() # Reset emulator state after loading new ROM
             for btn in (self.run_button, self.reset_button, self.step_button):
@@ -455,7 +618,7 @@ class EMUNESApp:
         # If you have other components like APU, reset them here too.
         # Potentially, re-initialize cartridge or parts of it if needed.
         
-        self.update_display()
+        self._request_display()
         self.log_message("System reset.")
         if self.running: # If it was running, stop it
             self.toggle_run() # This will change button text to "Run"
@@ -467,16 +630,26 @@ class EMUNESApp:
         if not self.rom_loaded:
             return
         self.running = not self.running
-        self.run_button.config(text="Pause" if self.running else "Run")
-        self.step_button.config(state=tk.DISABLED if self.running else tk.NORMAL)
-        self.reset_button.config(state=tk.DISABLED if self.running else tk.NORMAL) # Disable reset while running
+        self._set_run_controls(self.running) # Disable step/reset while running
         if self.running:
             self.log_message("Emulation started.")
+            self._start_worker()
             self._schedule_emulation()
         else:
+            self._stop_worker()
             self.log_message("Emulation paused.")
             self.update_display() # Update status when paused
 
+    def _on_speed_change(self, value):
+        self._speed_factor = float(value) / 100.0
+
+    def _set_run_controls(self, running: bool, idle_state: str = NORMAL):
+        """Sets the Run/Pause caption and Step/Reset availability in one go."""
+        state = DISABLED if running else idle_state
+        self._run_button_config(text="Pause" if running else "Run")
+        self._step_button_config(state=state)
+        self._reset_button_config(state=state)
+
     def step(self):
         if not self.rom_loaded or self.running:
             return
@@ -485,159 +658,159 @@ class EMUNESApp:
         try:
             self.bus.clock() # This is a stub, does nothing yet
             # Simulate some CPU/PPU activity for display
-            self.cpu.pc = (self.cpu.pc + 1) & 0xFFFF
-            self.cpu.cycles += 3 # Arbitrary
+            self.cpu.run_chunk(1) # Arbitrary 3 cycles
             self.ppu.cycle = (self.ppu.cycle + 3*3) % 341 # PPU runs 3x CPU speed
             if self.ppu.cycle < 3*3 : #Approximate new scanline
                 self.ppu.scanline = (self.ppu.scanline + 1) % 262
                 if self.ppu.scanline == 240: # VBlank
                     self.ppu.frame_complete = True # For a real emu
+                    self.ppu.dirty = True
             
         except Exception as e:
             self.log_message(f"Error during step: {e}")
             self.running = False # Stop emulation on error
-            self.run_button.config(text="Run")
-            self.step_button.config(state=tk.NORMAL)
-            self.reset_button.config(state=tk.NORMAL)
+            self._set_run_controls(False)
 
-        self.update_display()
+        self._request_display() # holding Step down no longer repaints once per click
 
     def _emulation_loop_iteration(self):
-        """Represents a small chunk of emulation, e.g., one frame."""
-        # For the stub, we just advance clocks a bit.
-        # A real emulator would run until a frame is complete.
+        """Emulates one frame."""
+        # A real emulator would run CPU/PPU clocks until a frame is complete.
         # Target is roughly 1/60th of a second of NES time.
         # NES CPU runs at ~1.79 MHz. PPU is 3x that.
         # Cycles per frame: ~29780.5 CPU cycles.
         
-        # Stub behavior: just one bus clock and update display
-        # In a real emulator, this loop would run many CPU/PPU clocks
-        # until self.ppu.frame_complete is True.
+        # Stub behavior: the PPU jumps straight to the end of the frame and the CPU is credited
+        # with the same number of steps in one call – no per-clock Python loop.
         if self.bus.cart and self.bus.cart.rom: # Check if ROM is loaded
-            # Simulate some activity for the stub
-            for _ in range(1000): # Simulate a few cycles for visual feedback
-                self.bus.clock() # This is a stub, does nothing yet
-                self.cpu.pc = (self.cpu.pc + 1) & 0xFFFF
-                self.cpu.cycles += 3
-                self.ppu.cycle = (self.ppu.cycle + 3*3) % 341
-                if self.ppu.cycle < 3*3:
-                    self.ppu.scanline = (self.ppu.scanline + 1) % 262
-                    if self.ppu.scanline == 0: # New frame
-                        self.ppu.frame_complete = True
-                        break # Exit loop for this frame
+            self.cpu.run_chunk(self.ppu.run_frame())
             
             if self.ppu.frame_complete:
-                self.update_display()
+                self._compose_frame()
                 self.ppu.frame_complete = False # Reset for next frame
         else: # Should not happen if running flag is managed correctly
             self.running = False 
 
 
+    def _start_worker(self):
+        """Starts the emulation thread; the Tk thread only presents what it produces."""
+        self._stop_worker() # never let two workers share one PPU
+        self._worker_error = None
+        self._worker_stop = threading.Event()
+        self._worker = threading.Thread(target=self._emulation_worker, args=(self._worker_stop,), daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self):
+        self._worker_stop.set() # wakes the worker out of its pacing wait
+        if self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join()
+        self._worker = None
+
+    def _emulation_worker(self, stop: threading.Event):
+        """Emulates frames at the target rate until stopped. Runs off the Tk thread – no widget access here."""
+        deadline = time.perf_counter()
+        while self.running and self.rom_loaded and not stop.is_set():
+            try:
+                self._emulation_loop_iteration() # Emulate one "frame" or chunk
+            except Exception as e:
+                self._worker_error = e # reported by the Tk thread on its next tick
+                self.running = False # Stop emulation on error
+                return
+            deadline += (1.0 / self.target_fps) / self._speed_factor
+            delay_seconds = deadline - time.perf_counter()
+            if delay_seconds > 0:
+                stop.wait(delay_seconds)
+            else: # running behind – don't try to catch up with a burst of frames
+                deadline = time.perf_counter()
+
+    def _compose_frame(self):
+        """Builds the finished frame off-screen and publishes it for the next present (worker thread)."""
+        ppu = self.ppu
+        if not ppu.dirty: # nothing new since the last frame
+            return
+        ppu.dirty = False
+        # This is a stub. A real PPU would have a palette and pixel data.
+        # Simulate some visual change - random indices, composed to RGB as one P6 blob
+        ppu.screen[:] = random.randbytes(NES_WIDTH * NES_HEIGHT) # one C-level draw per frame
+        frame = ppu.compose_ppm()
+        with self._swap_lock:
+            self._front = frame
+
     def _schedule_emulation(self):
+        """Tk-side tick while running: reports worker errors and presents the latest frame."""
         if not self.running or not self.rom_loaded:
-            self.run_button.config(text="Run")
-            self.step_button.config(state=tk.NORMAL if self.rom_loaded else tk.DISABLED)
-            self.reset_button.config(state=tk.NORMAL if self.rom_loaded else tk.DISABLED)
+            self._stop_worker()
+            if self._worker_error is not None:
+                self.log_message(f"Runtime error: {self._worker_error}")
+                self._worker_error = None
+            self._set_run_controls(False, NORMAL if self.rom_loaded else DISABLED)
             if self.running: # If it was running but ROM somehow unloaded
                  self.log_message("Emulation stopped: ROM not available.")
             self.running = False
-            return
-
-        frame_start_time = time.perf_counter()
-
-        try:
-            self._emulation_loop_iteration() # Emulate one "frame" or chunk
-        except Exception as e:
-            self.log_message(f"Runtime error: {e}")
-            self.running = False # Stop emulation on error
-            self.run_button.config(text="Run")
-            self.step_button.config(state=tk.NORMAL)
-            self.reset_button.config(state=tk.NORMAL)
             self.update_display() # Show final state
             return
-        
-        frame_end_time = time.perf_counter()
-        emulation_time = frame_end_time - frame_start_time
-
-        speed_factor = self.speed_scale.get() / 100.0
-        target_frame_duration = (1.0 / self.target_fps) / speed_factor
-        
-        delay_seconds = target_frame_duration - emulation_time
-        delay_ms = int(delay_seconds * 1000)
 
-        if self.running: # Check again, as an error might have stopped it
-            self.root.after(max(1, delay_ms), self._schedule_emulation)
-        else: # Update UI if stopped during emulation
-            self.update_display()
+        self.update_display()
+        self.root.after(PRESENT_INTERVAL_MS, self._schedule_emulation)
 
 
     # --------------------------------------------------
     #   screen / status updates
     # --------------------------------------------------
+    def _blit_ppm(self, ppm: bytes):
+        """Uploads a whole frame to the PhotoImage and zooms it onto the display image – two Tcl calls in all."""
+        try:
+            self.screen_image.configure(data=ppm, format="PPM")
+            # pixel replication happens in Tk's C code straight into the persistent display image
+            self.display_image.tk.call(self.display_image, "copy", self.screen_image, "-zoom", SCREEN_ZOOM, SCREEN_ZOOM)
+        except tk.TclError as e:
+            # This can happen if the image is somehow invalidated during shutdown
+            print(f"TclError blitting screen: {e}")
+
     def draw_nes_screen(self):
         """Paint a completely black frame so the canvas isn’t empty before a ROM is loaded."""
-        # Tkinter PhotoImage put requires hex color strings per pixel for rows
-        # Format: "{#RRGGBB #RRGGBB ...}" for a row
-        black_pixel = "#000000" 
-        row_data = "{" + " ".join([black_pixel] * NES_WIDTH) + "}"
-        for y in range(NES_HEIGHT):
-            try:
-                self.screen_image.put(row_data, (0, y))
-            except tk.TclError as e:
-                # This can happen if the image is somehow invalidated during shutdown
-                print(f"TclError drawing blank screen (y={y}): {e}")
-                break
+        self._blit_ppm(BLANK_PPM)
+        self._screen_blank = True
 
 
     def render_screen(self):
-        """Renders the PPU's screen buffer to the PhotoImage."""
-        # This is a stub. A real PPU would have a palette and pixel data.
-        # For now, we'll just draw random noise if running, or black if not.
+        """Presents the newest frame produced by the emulation worker."""
         if self.running and self.rom_loaded:
-            # Simulate some visual change - random colors
-            for y in range(NES_HEIGHT):
-                row_pixels = []
-                for x in range(NES_WIDTH):
-                    # Generate a random grayscale color for the stub
-                    gray_val = random.randint(0, 255)
-                    hex_color = f"#{gray_val:02x}{gray_val:02x}{gray_val:02x}"
-                    row_pixels.append(hex_color)
-                row_data = "{" + " ".join(row_pixels) + "}"
-                try:
-                    self.screen_image.put(row_data, (0, y))
-                except tk.TclError as e:
-                     # This can happen if the image is somehow invalidated during shutdown
-                    print(f"TclError rendering screen (y={y}): {e}")
-                    break # Stop trying to draw if image is bad
-        else:
-            # If not running or no ROM, draw a black screen
+            with self._swap_lock:
+                frame, self._front = self._front, None
+            if frame is None: # nothing new since the last upload
+                return
+            self._screen_blank = False
+            self._blit_ppm(frame)
+        elif not self._screen_blank:
+            # If not running or no ROM, draw a black screen (once – it doesn't change until we run again)
             self.draw_nes_screen()
 
 
     def update_display(self):
-        # CPU flags – all dashes because the stub CPU doesn’t implement them yet
-        # In a real CPU, you'd format self.cpu.status or call get_flag()
-        flags_str = "".join([
-            'N' if self.cpu.get_flag(CPU6502.FLAG_N) else '-',
-            'V' if self.cpu.get_flag(CPU6502.FLAG_V) else '-',
-            '-', # Unused flag
-            'B' if self.cpu.get_flag(CPU6502.FLAG_B) else '-',
-            'D' if self.cpu.get_flag(CPU6502.FLAG_D) else '-',
-            'I' if self.cpu.get_flag(CPU6502.FLAG_I) else '-',
-            'Z' if self.cpu.get_flag(CPU6502.FLAG_Z) else '-',
-            'C' if self.cpu.get_flag(CPU6502.FLAG_C) else '-'
-        ])
+        # CPU flags – all dashes while the stub CPU leaves P clear; one table lookup instead of eight get_flag calls
+        flags_str = FLAG_STR_LUT[self.cpu.status & 0xFF]
         
         # Basic check for rom data before accessing cpu/ppu registers for display
         if self.rom_loaded and self.bus.cart and self.bus.cart.rom:
-            self.cpu_info.config(text=f"CPU: A={self.cpu.a:02X} X={self.cpu.x:02X} Y={self.cpu.y:02X} SP={self.cpu.stkp:02X} PC={self.cpu.pc:04X} P=[{flags_str}] CYC:{self.cpu.cycles}")
-            self.ppu_info.config(text=f"PPU: Scanline={self.ppu.scanline:3d} Cycle={self.ppu.cycle:3d} V={self.ppu.v:04X} T={self.ppu.t:04X}")
+            cpu, ppu = self.cpu, self.ppu
+            self.cpu_info.config(text=_CPU_FMT % (cpu.a, cpu.x, cpu.y, cpu.stkp, cpu.pc, flags_str, cpu.cycles))
+            self.ppu_info.config(text=_PPU_FMT % (ppu.scanline, ppu.cycle, ppu.v, ppu.t))
         else:
             self.cpu_info.config(text="CPU: [No ROM / Halted]")
             self.ppu_info.config(text="PPU: [No ROM / Halted]")
 
         self.render_screen()
-        self.root.update_idletasks() # Process pending UI events
+        # no update_idletasks() here – the mainloop repaints on its own schedule
+
+    def _request_display(self):
+        """Coalesces refresh requests (stepping, reset) into at most one update_display per present interval."""
+        if self._display_job is None:
+            self._display_job = self.root.after(PRESENT_INTERVAL_MS, self._display_tick)
+
+    def _display_tick(self):
+        self._display_job = None
+        self.update_display()
 
 # ------------------------------------------------------------
 #                               main‑program
@@ -11,6 +11,10 @@ DARK_FG = "#E0E0E0"  # Text color
 # NES Screen dimensions
 NES_WIDTH = 256
 NES_HEIGHT = 240
+# Binary PPM (P6) header for a full frame; PhotoImage decodes it in C
+PPM_HEADER = b"P6\n%d %d\n255\n" % (NES_WIDTH, NES_HEIGHT)
+# ~29,781 CPU cycles per frame is approximate for NTSC.
+CYCLES_PER_FRAME = 29781
 
 # iNES Header Constants
 INES_HEADER_SIZE = 16
@@ -67,6 +71,7 @@ class CPU6502:
     """A very minimal 6502 CPU emulator with a partial opcode set."""
     def __init__(self, bus):
         self.bus = bus
+        self.bus_read = bus.read  # bound once; every fetch goes through it
         self.pc = 0x0000
         self.sp = 0xFD
         self.a = self.x = self.y = 0
@@ -74,16 +79,19 @@ class CPU6502:
         self.cycles = 0
 
         # Partial opcode table
-        self.opcodes = {
-            0xEA: self.op_nop,
-            0xA9: self.op_lda_imm,
-            0xAD: self.op_lda_abs,
-            0x8D: self.op_sta_abs,
-            0xA2: self.op_ldx_imm,
-            0x9A: self.op_txs,
-            0x78: self.op_sei,
-            0x4C: self.op_jmp_abs,
+        op_map = {
+            0xEA: CPU6502.op_nop,
+            0xA9: CPU6502.op_lda_imm,
+            0xAD: CPU6502.op_lda_abs,
+            0x8D: CPU6502.op_sta_abs,
+            0xA2: CPU6502.op_ldx_imm,
+            0x9A: CPU6502.op_txs,
+            0x78: CPU6502.op_sei,
+            0x4C: CPU6502.op_jmp_abs,
         }
+        # Fully populated 256-entry dispatch tuple (unimplemented opcodes act as NOP):
+        # a plain index per instruction, no hashing and no .get() default
+        self.op_table = tuple(op_map.get(i, CPU6502.op_nop) for i in range(256))
 
     def set_flag(self, mask, value):
         """Set or clear a status flag."""
@@ -110,17 +118,30 @@ class CPU6502:
 
     def fetch(self):
         """Fetch the next opcode or operand byte from memory."""
-        val = self.bus.read(self.pc)
+        val = self.bus_read(self.pc)
         self.pc = (self.pc + 1) & 0xFFFF
         return val
 
     def step(self):
         """Execute one instruction and return the number of CPU cycles used."""
-        opcode = self.fetch()
-        handler = self.opcodes.get(opcode, self.op_nop)
-        handler()
+        opcode = self.bus_read(self.pc)
+        self.pc = (self.pc + 1) & 0xFFFF
+        self.op_table[opcode](self)
         return self.cycles
 
+    def run_block(self, cycle_budget):
+        """Execute instructions until at least `cycle_budget` cycles have run; return the cycles actually used."""
+        # Hot loop: table, fetch and the stop mark live in locals instead of being looked up per instruction
+        op_table = self.op_table
+        read = self.bus_read
+        start = self.cycles
+        stop = start + cycle_budget
+        while self.cycles < stop:
+            opcode = read(self.pc)
+            self.pc = (self.pc + 1) & 0xFFFF
+            op_table[opcode](self)
+        return self.cycles - start
+
     # --- Opcodes Implementation ---
     def op_nop(self):
         self.cycles += 2
@@ -171,8 +192,8 @@ class PPU2C02:
     """A stub PPU that stores CHR data and simulates a small palette."""
     def __init__(self, chr_data: bytes):
         self.chr = chr_data
-        # Create a placeholder screen: 240 rows of 256 pixels (indexes into self.palette)
-        self.screen = [[0]*NES_WIDTH for _ in range(NES_HEIGHT)]
+        # Placeholder screen: one flat row-major buffer of 240*256 palette indexes; pixel (x, y) is at y*NES_WIDTH + x
+        self.screen = bytearray(NES_WIDTH * NES_HEIGHT)
 
         # Very simplified palette (4 colors + pad out to 64 total)
         # Expand/replace with real NES palette as needed.
@@ -182,6 +203,10 @@ class PPU2C02:
             (8,16,144),    # example mid-blue
             (48,0,136)     # example purple
         ] + [(0,0,0)] * 60
+        # Per-channel bytes.translate tables (index -> R, G, B); indexes wrap onto the 64 entries
+        self.palette_rgb = tuple(
+            bytes(self.palette[i % len(self.palette)][channel] for i in range(256)) for channel in range(3)
+        )
 
         self.scanline = 0
         self.cycle = 0
@@ -217,7 +242,7 @@ class PPU2C02:
         # Add more logic if you want to handle real scanlines, sprite draws, etc.
 
     def render(self):
-        """Return the current 2D screen buffer."""
+        """Return the current flat screen buffer."""
         return self.screen
 
 
@@ -375,25 +400,28 @@ class EMUNESApp:
         Tries to render ~60 frames per second.
         """
         target_frame_time = 1 / 60
-        colors = [f"#{r:02x}{g:02x}{b:02x}" for (r, g, b) in self.ppu.palette]
+        red, green, blue = self.ppu.palette_rgb
+        rgb = bytearray(NES_WIDTH * NES_HEIGHT * 3)  # reused every frame
+
+        overrun = 0  # cycles the last instruction of a frame spilled into the next one
 
         while self.is_running:
             start_time = time.perf_counter()
-            cycles = 0
-            # ~29,781 CPU cycles per frame is approximate for NTSC.
-            while cycles < 29781 and self.is_running:
-                cyc = self.cpu.step()
-                self.ppu.tick(cyc)
-                cycles += cyc
+            # One call runs the whole frame's worth of instructions
+            budget = CYCLES_PER_FRAME - overrun
+            cycles = self.cpu.run_block(budget)
+            self.ppu.tick(cycles)
+            overrun = cycles - budget
 
             # Render frame from PPU
             frame = self.ppu.render()
 
-            # Convert the frame to PhotoImage data
+            # Palette lookup is one translate per channel; the PPM blob goes to Tk in a single call
+            rgb[0::3] = frame.translate(red)
+            rgb[1::3] = frame.translate(green)
+            rgb[2::3] = frame.translate(blue)
             try:
-                for y in range(NES_HEIGHT):
-                    row_pixels = "{" + " ".join(colors[frame[y][x]] for x in range(NES_WIDTH)) + "}"
-                    self.photo.put(row_pixels, to=(0, y))
+                self.photo.configure(data=PPM_HEADER + rgb, format="PPM")
             except tk.TclError:
                 # Thrown if the window is closed mid-update
                 break